@@ -0,0 +1,50 @@
+import os
+import threading
+from collections import OrderedDict
+
+# ============================
+# Aggregate memoization
+# ============================
+# Derived aggregates (Key Insights numbers, category summaries, monthly
+# totals) keyed by (dataset version, filter state). Streamlit serves every
+# session from threads of one process, so a single locked LRU is shared by
+# all of them; flipping back to a recent filter combination is a dict hit.
+
+MAX_ENTRIES = int(os.environ.get("SALES_AGG_CACHE_ENTRIES", "256"))
+
+
+class AggregateCache:
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing (and storing) it on a miss.
+
+        Cached values are shared between sessions and must not be mutated.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Compute outside the lock so a slow aggregate doesn't block other sessions
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,81 @@
+"""Eager vs. deferred chart rendering.
+
+  import plotly.express   one-off cost the scripts used to pay at startup,
+                          measured in a fresh interpreter
+  eager rerun             monthly + category + negative-GP aggregation and
+                          all five figures, as every rerun used to build them
+  deferred (open, hit)    an open section whose figures are already in the
+                          aggregate cache (paging/sorting the table)
+
+With the sections closed a rerun builds nothing, so the eager column is
+what it saves. Figures are built but not serialized to the browser, so the numbers are a
+lower bound on what each rerun saves. Uses the synthetic sales workbooks
+(see synthetic.py).
+
+Run from the repository root:
+
+    python benchmarks/bench_charts.py [--sizes 10000 100000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agg_cache import AggregateCache
+from branches import derive_totals
+from charts import category_bars, monthly_bar, negative_gp_bar
+from months import build_month_view, monthly_totals
+from reports import category_gp_summary, negative_gp_by_category
+from synthetic import synthetic_sales
+
+SIZES = [10_000, 100_000]
+REPEATS = 3
+
+
+def best_of(fn, repeats=REPEATS):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def plotly_import_seconds():
+    code = "import time; t = time.perf_counter(); import plotly.express; print(time.perf_counter() - t)"
+    return float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+
+
+def all_figures(view, df):
+    monthly = monthly_totals(view)
+    monthly['Month'] = monthly['Month'].astype(str)
+    monthly_df = monthly.melt(id_vars='Month', value_vars=['Sales','Profit'], var_name='Type', value_name='Value')
+    return [monthly_bar(monthly_df), *category_bars(category_gp_summary(df)), negative_gp_bar(negative_gp_by_category(df))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    args = parser.parse_args()
+
+    print(f"import plotly.express: {plotly_import_seconds() * 1000:,.1f} ms (fresh interpreter)\n")
+    print(f"{'rows':>9} {'eager (ms)':>11} {'open hit (ms)':>14}")
+    for rows in args.sizes:
+        sales = synthetic_sales(rows)
+        df = derive_totals(sales.copy())
+        view = build_month_view(sales)
+
+        eager = best_of(lambda: all_figures(view, df))
+        cache = AggregateCache()
+        key = ("bench", rows, "chart", "all")
+        cache.get_or_compute(key, lambda: all_figures(view, df))
+        open_hit = best_of(lambda: cache.get_or_compute(key, lambda: all_figures(view, df)))
+        print(f"{rows:>9,} {eager * 1000:>11.2f} {open_hit * 1000:>14.4f}")
+
+
+if __name__ == "__main__":
+    main()
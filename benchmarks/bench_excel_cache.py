@@ -0,0 +1,49 @@
+"""Cold Excel parse vs. cached Parquet load on the bundled workbooks.
+
+Run from the repository root:
+
+    python benchmarks/bench_excel_cache.py
+"""
+import glob
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import data_cache
+
+REPEATS = 3
+
+
+def best_of(fn, repeats=REPEATS):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    workbooks = sorted(glob.glob(os.path.join(root, "*.Xlsx")))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        data_cache.CACHE_DIR = cache_dir
+        print(f"{'workbook':<40} {'rows':>7} {'excel (s)':>10} {'parquet (s)':>12} {'speedup':>8}")
+        for path in workbooks:
+            excel_time = best_of(lambda: pd.read_excel(path))
+            df = data_cache.read_excel_cached(path)  # populate the sidecar
+            cached_time = best_of(lambda: data_cache.read_excel_cached(path))
+            print(
+                f"{os.path.basename(path):<40} {len(df):>7} {excel_time:>10.3f} "
+                f"{cached_time:>12.4f} {excel_time / cached_time:>7.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
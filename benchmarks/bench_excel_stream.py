@@ -0,0 +1,64 @@
+"""Peak RSS while loading a sales export: pd.read_excel vs. the streaming reader.
+
+Each method runs in a fresh interpreter, and the peak resident set size above
+the post-import baseline is reported:
+
+  read_excel          pd.read_excel, then derive_totals + compact_frame
+                      (the original load_data path)
+  stream              read_excel_streaming, then derive_totals + compact_frame
+
+Run from the repository root:
+
+    python benchmarks/bench_excel_stream.py ["shams july to oct 16 sales(1).Xlsx"]
+"""
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from branches import derive_totals
+from compact import compact_frame
+from excel_stream import read_excel_streaming
+
+DEFAULT_WORKBOOK = os.path.join(ROOT, "shams july to oct 16 sales(1).Xlsx")
+
+METHODS = {
+    "read_excel": lambda path: compact_frame(derive_totals(pd.read_excel(path))),
+    "stream": lambda path: compact_frame(derive_totals(read_excel_streaming(path))),
+}
+
+
+def current_rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def child(method, path):
+    baseline = current_rss_mb()
+    start = time.perf_counter()
+    df = METHODS[method](path)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+    frame_mb = df.memory_usage(deep=True).sum() / 2**20
+    print(f"{method:<18} {elapsed:>8.2f} {peak - baseline:>14.1f} {frame_mb:>10.1f}")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+        return
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_WORKBOOK
+    print(os.path.basename(path))
+    print(f"{'method':<18} {'time (s)':>8} {'peak RSS (MB)':>14} {'frame (MB)':>10}")
+    for method in METHODS:
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--child", method, path], check=True)
+
+
+if __name__ == "__main__":
+    main()
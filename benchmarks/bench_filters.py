@@ -0,0 +1,77 @@
+"""Mask-chain filtering vs. the precomputed Category x GP band index.
+
+Times every sidebar combination (include category x GP band, plus one
+exclude-categories case) on the October branch workbooks.
+
+Run from the repository root:
+
+    python benchmarks/bench_filters.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from branches import BRANCHES, GP_OPTIONS, derive_totals
+from data_cache import read_excel_cached
+from filter_index import build_filter_index, select_rows
+
+
+def mask_filters(df, selected_category, exclude_categories, selected_gp):
+    # The filter chain the dashboards used before the index
+    filtered_df = df.copy()
+    if selected_category != 'All':
+        filtered_df = filtered_df[filtered_df['Category'] == selected_category]
+    if exclude_categories:
+        filtered_df = filtered_df[~filtered_df['Category'].isin(exclude_categories)]
+    if selected_gp != 'All':
+        if selected_gp == "<5%":
+            filtered_df = filtered_df[filtered_df['GP%'] < 5]
+        elif selected_gp == "5-10%":
+            filtered_df = filtered_df[(filtered_df['GP%'] >= 5) & (filtered_df['GP%'] < 10)]
+        elif selected_gp == "10-20%":
+            filtered_df = filtered_df[(filtered_df['GP%'] >= 10) & (filtered_df['GP%'] < 20)]
+        elif selected_gp == "20-30%":
+            filtered_df = filtered_df[(filtered_df['GP%'] >= 20) & (filtered_df['GP%'] < 30)]
+        elif selected_gp == "30%+":
+            filtered_df = filtered_df[filtered_df['GP%'] >= 30]
+    return filtered_df
+
+
+def index_filters(df, index, selected_category, exclude_categories, selected_gp):
+    return df.iloc[select_rows(index, selected_category, exclude_categories, selected_gp)]
+
+
+def main():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    print(f"{'branch':<12} {'rows':>6} {'combos':>7} {'masks (ms)':>11} {'index (ms)':>11} {'speedup':>8}")
+    for branch, info in BRANCHES.items():
+        df = derive_totals(read_excel_cached(os.path.join(root, info["file"])))
+        index = build_filter_index(df)
+        categories = df['Category'].unique().tolist()
+        combos = [(category, [], gp) for category in ['All'] + categories for gp in GP_OPTIONS]
+        combos.append(('All', categories[:3], 'All'))
+
+        mask_time = index_time = 0.0
+        for combo in combos:
+            start = time.perf_counter()
+            expected = mask_filters(df, *combo)
+            mask_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = index_filters(df, index, *combo)
+            index_time += time.perf_counter() - start
+
+            pd.testing.assert_frame_equal(result, expected)
+
+        print(
+            f"{branch:<12} {len(df):>6} {len(combos):>7} {mask_time / len(combos) * 1000:>11.3f} "
+            f"{index_time / len(combos) * 1000:>11.3f} {mask_time / index_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
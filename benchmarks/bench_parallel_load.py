@@ -0,0 +1,60 @@
+"""Cold start for every report workbook: sequential vs. process-pool loading.
+
+Both runs parse the workbooks from scratch (empty sidecar cache and sales
+store), so the numbers reflect openpyxl parsing rather than Parquet reads.
+
+Run from the repository root:
+
+    python benchmarks/bench_parallel_load.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import data_cache
+import sales_store
+from parallel_load import load_workbooks
+from reports import load_items, report_jobs
+
+
+def main():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    jobs = {
+        name: (os.path.join(root, job["file"]), job["branch"], job["months"])
+        for name, job in report_jobs().items()
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Worker processes are forked from here and inherit both settings
+        sales_store.STORE_DIR = os.path.join(tmp, "store")
+
+        data_cache.CACHE_DIR = os.path.join(tmp, "sequential")
+        sequential = {}
+        start = time.perf_counter()
+        for name, job in jobs.items():
+            file_start = time.perf_counter()
+            load_items(*job)
+            sequential[name] = time.perf_counter() - file_start
+        sequential_total = time.perf_counter() - start
+
+        data_cache.CACHE_DIR = os.path.join(tmp, "parallel")
+        start = time.perf_counter()
+        _, timings = load_workbooks(jobs)
+        parallel_total = time.perf_counter() - start
+
+    report = pd.DataFrame(timings).set_index("name")
+    report["sequential_s"] = pd.Series(sequential).round(3)
+    print(report[["rows", "sequential_s", "parse_s", "transfer_kb", "ready_s", "error"]].to_string())
+    print(
+        f"\nsequential: {sequential_total:.2f}s   parallel: {parallel_total:.2f}s   "
+        f"slowest file: {max(sequential.values()):.2f}s   workers: {min(len(jobs), os.cpu_count() or 1)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
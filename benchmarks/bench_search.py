@@ -0,0 +1,90 @@
+"""Indexed search + precomputed join vs. str.contains + pd.merge on a 100k-item price list.
+
+The price list is synthesized from the item names and codes in
+"july to sep safa2025.Xlsx" (the real price list is not bundled).
+
+Run from the repository root:
+
+    python benchmarks/bench_search.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from data_cache import read_excel_cached
+from price_join import build_price_sales_join, joined_rows
+from search_index import build_search_index, search_items
+
+WORKBOOK = "july to sep safa2025.Xlsx"
+PRICE_ROWS = 100_000
+QUERIES = [("chicken", ""), ("milk", ""), ("tomato", ""), ("", "9910"), ("", "62870"), ("rice", "62"), ("ab", ""), ("a", "")]
+REPEATS = 5
+
+
+def synthetic_price_list(sales_df, rows):
+    rng = np.random.default_rng(0)
+    picks = rng.integers(0, len(sales_df), rows)
+    names = sales_df['Items'].to_numpy(dtype=object)[picks]
+    codes = sales_df['Item Code'].astype(str).to_numpy(dtype=object)[picks]
+    # Half the rows get fresh barcodes so the join has unmatched items too
+    fresh = rng.random(rows) < 0.5
+    codes[fresh] = [str(8_000_000_000_000 + i) for i in np.flatnonzero(fresh)]
+    cost = rng.uniform(1, 50, rows).round(2)
+    return pd.DataFrame({
+        'Item Bar Code': codes,
+        'Item Name': [f"{name} {i}" for i, name in enumerate(names)],
+        'Cost': cost,
+        'Selling': (cost * 1.25).round(2),
+        'Stock': rng.integers(0, 100, rows),
+    })
+
+
+def best_of(fn):
+    best, result = float("inf"), None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def scan_search(price_df, sales_df, item_search, barcode_search):
+    search_base = price_df.copy()
+    if item_search:
+        search_base = search_base[search_base['Item Name'].str.contains(item_search, case=False, na=False)]
+    if barcode_search:
+        search_base = search_base[search_base['Item Bar Code'].str.contains(barcode_search, case=False, na=False)]
+    return pd.merge(search_base, sales_df, left_on='Item Bar Code', right_on='Item Code', how='left')
+
+
+def main():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sales_df = read_excel_cached(os.path.join(root, WORKBOOK))
+    sales_df['Item Code'] = sales_df['Item Code'].astype(str)
+    price_df = synthetic_price_list(sales_df, PRICE_ROWS)
+
+    start = time.perf_counter()
+    index = build_search_index(price_df)
+    join = build_price_sales_join(price_df, sales_df)
+    print(f"index + join build for {PRICE_ROWS:,} items: {time.perf_counter() - start:.2f}s\n")
+
+    print(f"{'name':<10} {'barcode':<8} {'rows':>7} {'scan+merge (ms)':>16} {'index (ms)':>11} {'index+frame (ms)':>17}")
+    for item_search, barcode_search in QUERIES:
+        expected, scan_time = best_of(lambda: scan_search(price_df, sales_df, item_search, barcode_search))
+        rows, index_time = best_of(lambda: joined_rows(join, search_items(index, item_search, barcode_search)))
+        result, frame_time = best_of(lambda: join["joined"].iloc[rows].reset_index(drop=True))
+
+        pd.testing.assert_frame_equal(result, expected.reset_index(drop=True), check_dtype=False)
+        print(
+            f"{item_search:<10} {barcode_search:<8} {len(result):>7} {scan_time * 1000:>16.1f} "
+            f"{index_time * 1000:>11.2f} {(index_time + frame_time) * 1000:>17.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
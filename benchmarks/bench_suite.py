@@ -0,0 +1,148 @@
+"""End-to-end timings on synthetic workbooks at 10k / 100k / 1M rows.
+
+For each size a sales export and price list are generated once (see
+synthetic.py) and every hot path the dashboards run is timed:
+
+  load_data (excel)   pd.read_excel + derive_totals, the original load path
+  load cold           read_excel_cached on an empty sidecar cache (streaming
+                      parse + Parquet write) + derive + compact
+  load warm           the same with the sidecar in place
+  derive_totals       Category fill, Total Sales/Profit, GP%, GP band
+  compute_row_totals  the original per-row totals apply (see bench_totals.py)
+  month view          build_month_view: long month facts plus Total Sales /
+                      Total Profit / Overall GP per item (replaces it)
+  filter index        build_filter_index
+  filters             mean over every GP band and the five largest categories
+  category summary    category_gp_summary
+  negative GP         negative_gp_by_category
+  key insights        key_insights
+  cube build          build_cube (rollup_cube.py), done once at ingest
+  cube insights       mean over the same filters, answered from the cube
+  GP% percentiles     mean over the same filters, from the cube's histogram
+  price join          build_price_sales_join
+  inventory           build_inventory over the joined month view
+
+Run from the repository root:
+
+    python benchmarks/bench_suite.py [--sizes 10000 100000 1000000] [--json results.jsonl] [--full]
+
+pd.read_excel and the row-wise apply take minutes at 1M rows, so
+"load_data (excel)" and "compute_row_totals" are skipped above
+EXCEL_ROW_LIMIT rows unless --full is given. --json appends one line
+per size so runs can be compared over time.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+import data_cache
+from bench_totals import compute_row_totals
+from branches import GP_OPTIONS, derive_totals
+from compact import compact_frame
+from filter_index import build_filter_index
+from gp_sketch import histogram_percentiles
+from inventory import build_inventory
+from months import build_month_view, month_columns
+from price_join import build_price_sales_join
+from reports import category_gp_summary, filter_items, key_insights, negative_gp_by_category
+from rollup_cube import build_cube, cube_insights, slice_cube
+from synthetic import workbook_paths
+
+SIZES = [10_000, 100_000, 1_000_000]
+EXCEL_ROW_LIMIT = 100_000
+REPEATS = 3
+
+
+def best_of(fn, repeats=REPEATS):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def once(fn):
+    return best_of(fn, repeats=1)
+
+
+def run_size(rows, full=False):
+    timings = {}
+    start = time.perf_counter()
+    sales_path, price_path = workbook_paths(rows)
+    timings["generate (cached)"] = time.perf_counter() - start
+
+    if full or rows <= EXCEL_ROW_LIMIT:
+        timings["load_data (excel)"], _ = once(lambda: derive_totals(pd.read_excel(sales_path)))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        data_cache.CACHE_DIR = cache_dir
+        load = lambda: compact_frame(derive_totals(data_cache.read_excel_cached(sales_path)))
+        timings["load cold"], _ = once(load)
+        timings["load warm"], df = best_of(load)
+        price_df = data_cache.read_excel_cached(price_path)
+
+    timings["derive_totals"], _ = best_of(lambda: derive_totals(df.copy()))
+    if full or rows <= EXCEL_ROW_LIMIT:
+        months = month_columns(df.columns)
+        month_cols = ([sales for sales, _ in months.values()], [profit for _, profit in months.values()])
+        timings["compute_row_totals"], _ = once(lambda: df.apply(compute_row_totals, axis=1, args=month_cols))
+    timings["month view"], _ = best_of(lambda: build_month_view(df))
+
+    timings["filter index"], index = best_of(lambda: build_filter_index(df))
+    categories = df['Category'].value_counts().index[:5].tolist()
+    combos = [('All', (), gp) for gp in GP_OPTIONS] + [(category, (), 'All') for category in categories]
+    filter_time, _ = best_of(lambda: [filter_items(df, *combo, index=index) for combo in combos])
+    timings["filters (mean)"] = filter_time / len(combos)
+
+    timings["category summary"], _ = best_of(lambda: category_gp_summary(df))
+    timings["negative GP"], _ = best_of(lambda: negative_gp_by_category(df))
+    timings["key insights"], _ = best_of(lambda: key_insights(df))
+    timings["cube build"], cube = best_of(lambda: build_cube(df))
+    cube_time, _ = best_of(lambda: [cube_insights(slice_cube(cube, *combo)) for combo in combos])
+    timings["cube insights"] = cube_time / len(combos)
+    hist_time, _ = best_of(lambda: [histogram_percentiles(slice_cube(cube, *combo)["hist"]) for combo in combos])
+    timings["GP% percentiles"] = hist_time / len(combos)
+
+    timings["price join"], join = best_of(lambda: build_price_sales_join(price_df, df))
+    view = build_month_view(join["joined"])
+    timings["inventory"], _ = best_of(lambda: build_inventory(join, view))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--json", help="append results as JSON lines to this file")
+    parser.add_argument("--full", action="store_true", help="time pd.read_excel at every size")
+    args = parser.parse_args()
+
+    results = {}
+    for rows in args.sizes:
+        results[rows] = run_size(rows, args.full)
+        print(f"{rows:>9} rows done", file=sys.stderr)
+        if args.json:
+            with open(args.json, "a", encoding="utf-8") as f:
+                f.write(json.dumps({
+                    "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    "rows": rows,
+                    "seconds": results[rows],
+                }) + "\n")
+
+    table = pd.DataFrame(results)
+    table.columns = [f"{rows:,} rows" for rows in table.columns]
+    print((table * 1000).round(2).to_string(na_rep="-", float_format=lambda ms: f"{ms:,.2f}"))
+    print("\n(milliseconds; '-' = skipped)")
+
+
+if __name__ == "__main__":
+    main()
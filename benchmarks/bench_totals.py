@@ -0,0 +1,80 @@
+"""Row-wise apply vs. vectorized totals on "july to sep safa2025.Xlsx".
+
+The vectorized side is months.build_month_view, which computes Total Sales,
+Total Profit and Overall GP for every item from the long month facts; its
+totals are checked bit-for-bit against the original per-row function.
+
+Run from the repository root:
+
+    python benchmarks/bench_totals.py [--full]
+
+The row-wise apply takes minutes at 100x, so above APPLY_ROW_LIMIT rows its
+time is extrapolated from the per-row cost of the largest measured scale
+unless --full is given.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from data_cache import read_excel_cached
+from months import build_month_view
+
+WORKBOOK = "july to sep safa2025.Xlsx"
+SCALES = [1, 10, 100]
+APPLY_ROW_LIMIT = 200_000
+SALES_COLS = ['Jul-2025 Total Sales', 'Aug-2025 Total Sales', 'Sep-2025 Total Sales']
+PROFIT_COLS = ['Jul-2025 Total Profit', 'Aug-2025 Total Profit', 'Sep-2025 Total Profit']
+TOTAL_COLS = ['Total Sales', 'Total Profit', 'Overall GP']
+
+
+def compute_row_totals(row, sales_cols=SALES_COLS, profit_cols=PROFIT_COLS):
+    # The original per-row implementation from variance.py
+    total_sales = sum([row[col] if pd.notna(row[col]) else 0 for col in sales_cols])
+    total_profit = sum([row[col] if pd.notna(row[col]) else 0 for col in profit_cols])
+    overall_gp = (total_profit / total_sales) if total_sales != 0 else 0
+    return pd.Series([total_sales, total_profit, overall_gp])
+
+
+def vectorized_totals(df):
+    return build_month_view(df)["items"][TOTAL_COLS]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    base = read_excel_cached(os.path.join(root, WORKBOOK))
+
+    full = "--full" in sys.argv[1:]
+    per_row_apply = None
+
+    print(f"{'scale':>6} {'rows':>9} {'apply (s)':>10} {'vectorized (s)':>15} {'speedup':>8}")
+    for scale in SCALES:
+        df = pd.concat([base] * scale, ignore_index=True)
+        result, vector_time = timed(lambda: vectorized_totals(df))
+
+        if full or len(df) <= APPLY_ROW_LIMIT or per_row_apply is None:
+            expected, apply_time = timed(lambda: df.apply(compute_row_totals, axis=1))
+            expected.columns = TOTAL_COLS
+            pd.testing.assert_frame_equal(result, expected, check_exact=True)
+            per_row_apply = apply_time / len(df)
+            note = ""
+        else:
+            apply_time = per_row_apply * len(df)
+            note = " (apply time estimated)"
+
+        print(
+            f"{scale:>5}x {len(df):>9} {apply_time:>10.3f} {vector_time:>15.4f} "
+            f"{apply_time / vector_time:>7.0f}x{note}"
+        )
+
+if __name__ == "__main__":
+    main()
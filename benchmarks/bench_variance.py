@@ -0,0 +1,81 @@
+"""Cross-period variance: integer-key bincount join vs. a pandas merge.
+
+Times compute_variance (Jul-Sep vs Oct) for every comparable branch against
+the equivalent groupby + outer merge on string item codes, then the cached
+all-branches call. "totals" checks the variance's base sales against the sum
+of the base workbook's item rows, or its own Grand Total row where it has one.
+
+Run from the repository root:
+
+    python benchmarks/bench_variance.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from branches import BASE_PERIOD, CURRENT_PERIOD, PERIODS
+from data_cache import read_excel_cached
+from period_variance import all_branches_variance, comparable_branches, compute_variance
+from sales_store import load_sales
+
+REPEATS = 5
+
+
+def best_of(fn, repeats=REPEATS):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def merge_variance(base_df, base_months, current_df, current_months):
+    def period(df, months):
+        return pd.DataFrame({
+            'Item Code': df['Item Code'].astype(str),
+            'Sales': sum(df[f"{month} Total Sales"].fillna(0) for month in months),
+            'Profit': sum(df[f"{month} Total Profit"].fillna(0) for month in months),
+        }).groupby('Item Code').sum()
+    merged = period(base_df, base_months).join(period(current_df, current_months), how='outer', lsuffix=' base').fillna(0)
+    merged['Run Rate Delta'] = merged['Sales'] / len(current_months) - merged['Sales base'] / len(base_months)
+    return merged
+
+
+def workbook_sales(file_path, months):
+    # Read straight from the workbook, independently of load_sales
+    df = read_excel_cached(file_path)
+    sales = sum(df[f"{month} Total Sales"].fillna(0) for month in months)
+    total_row = df['Item Code'].astype(str).str.strip().str.lower() == "grand total"
+    return sales[total_row].sum() if total_row.any() else sales.sum()
+
+
+def main():
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    print(f"{'branch':<14} {'items':>7} {'merge (ms)':>11} {'bincount (ms)':>14} {'match':>6} {'totals':>7}")
+    total = 0.0
+    for branch in comparable_branches():
+        base, current = PERIODS[branch][BASE_PERIOD], PERIODS[branch][CURRENT_PERIOD]
+        args = (
+            load_sales(base["file"], branch, base["months"]), base["months"],
+            load_sales(current["file"], branch, current["months"]), current["months"],
+        )
+        merge_time, reference = best_of(lambda: merge_variance(*args))
+        engine_time, variance = best_of(lambda: compute_variance(*args))
+        total += engine_time
+        match = np.allclose(variance.set_index('Item Code').loc[reference.index, 'Run Rate Delta'], reference['Run Rate Delta'])
+        totals = np.isclose(variance['Base Sales'].sum(), workbook_sales(base["file"], base["months"]))
+        print(f"{branch:<14} {len(variance):>7} {merge_time * 1000:>11.1f} {engine_time * 1000:>14.1f} {str(match):>6} {str(totals):>7}")
+
+    all_branches_variance()  # populate the cache
+    cached_time, _ = best_of(all_branches_variance)
+    print(f"\nall branches: {total * 1000:.1f} ms computed, {cached_time * 1000:.1f} ms cached")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Synthetic sales exports and price lists in the real workbook layout.
+
+Sales workbooks have Item Code, Items, Category and one
+`<Mon>-<YYYY> Total Sales` / `<Mon>-<YYYY> Total Profit` pair per month;
+price lists have Item Bar Code, Item Name, Cost, Selling and Stock, mostly
+for the same codes. Values are drawn to look like the bundled exports: many
+zero months, long-tailed sales, a few percent of negative-GP items, some
+repeated item codes and missing categories.
+
+Generated workbooks are written once per (kind, rows, seed) under DATA_DIR
+and reused by later runs:
+
+    python benchmarks/synthetic.py 10000 100000 1000000
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+DATA_DIR = os.environ.get(
+    "SALES_BENCH_DATA",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"),
+)
+MONTHS = ["Jul-2025", "Aug-2025", "Sep-2025", "Oct-2025"]
+CATEGORIES = [
+    'FMCG FOOD', 'FMCG NON FOOD', 'BEVERAGES', 'CHILLED AND DAIRY', 'FROZEN', 'BAKERY',
+    'BUTCHERY', 'FISH', 'FRUITS&VEGETABLE', 'HOUSEHOLD', 'TOYS  & SPORTS', 'STATIONERY',
+    'COSMETICS', 'ELECTRONICS', 'GARMENTS', 'HOT FOOD',
+]
+WORDS = ['FRESH', 'PACK', 'MINI', 'GOLD', 'CLASSIC', 'FAMILY', 'ORIGINAL', 'LITE', 'JUMBO', 'ASSTD']
+
+
+def synthetic_sales(rows, months=MONTHS, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = rng.choice(9_000_000_000_000, size=rows, replace=False) + 1_000_000_000_000
+    # About 1% of rows repeat an earlier item code, as in the real exports
+    repeats = rng.random(rows) < 0.01
+    codes[repeats] = codes[rng.integers(0, rows, repeats.sum())]
+
+    weights = rng.dirichlet(np.ones(len(CATEGORIES)) * 0.8)
+    category = np.array(CATEGORIES, dtype=object)[rng.choice(len(CATEGORIES), rows, p=weights)]
+    category[rng.random(rows) < 0.005] = None
+
+    names = [f"{WORDS[a]} ITEM {code % 100000:05d} {WORDS[b]}" for a, b, code in zip(
+        rng.integers(0, len(WORDS), rows), rng.integers(0, len(WORDS), rows), codes,
+    )]
+    df = pd.DataFrame({'Item Code': codes, 'Items': names, 'Category': category})
+
+    base_sales = rng.lognormal(mean=4.0, sigma=1.6, size=rows)
+    margin = rng.normal(0.2, 0.12, size=rows)
+    margin[rng.random(rows) < 0.03] *= -1
+    for month in months:
+        active = rng.random(rows) < 0.7
+        sales = np.where(active, base_sales * rng.uniform(0.6, 1.4, rows), 0.0).round(2)
+        profit = (sales * (margin + rng.normal(0, 0.02, rows))).round(4)
+        df[f"{month} Total Sales"] = sales
+        df[f"{month} Total Profit"] = profit
+    return df
+
+
+def synthetic_price_list(sales_df, seed=0):
+    rng = np.random.default_rng(seed + 1)
+    rows = len(sales_df)
+    codes = sales_df['Item Code'].to_numpy().copy()
+    names = sales_df['Items'].to_numpy().copy()
+    # A tenth of the price list has never sold
+    fresh = rng.random(rows) < 0.1
+    codes[fresh] = rng.choice(900_000_000_000, size=fresh.sum(), replace=False) + 100_000_000_000
+    names[fresh] = [f"UNSOLD ITEM {code % 100000:05d}" for code in codes[fresh]]
+    cost = rng.uniform(0.5, 80, rows).round(2)
+    return pd.DataFrame({
+        'Item Bar Code': codes,
+        'Item Name': names,
+        'Cost': cost,
+        'Selling': (cost * rng.uniform(0.9, 1.6, rows)).round(2),
+        'Stock': rng.integers(0, 200, rows),
+    })
+
+
+def write_workbook(df, path):
+    book = Workbook(write_only=True)
+    sheet = book.create_sheet()
+    sheet.append(list(df.columns))
+    for row in df.astype(object).where(df.notna(), None).itertuples(index=False):
+        sheet.append(row)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    book.save(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def workbook_paths(rows, seed=0):
+    """(sales, price list) workbook paths, generating them if needed."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    sales_path = os.path.join(DATA_DIR, f"synthetic_sales_{rows}_{seed}.xlsx")
+    price_path = os.path.join(DATA_DIR, f"synthetic_price_{rows}_{seed}.xlsx")
+    if not (os.path.exists(sales_path) and os.path.exists(price_path)):
+        sales_df = synthetic_sales(rows, seed=seed)
+        write_workbook(sales_df, sales_path)
+        write_workbook(synthetic_price_list(sales_df, seed), price_path)
+    return sales_path, price_path
+
+
+def main():
+    for rows in [int(arg) for arg in sys.argv[1:]] or [10_000]:
+        start = time.perf_counter()
+        paths = workbook_paths(rows)
+        print(f"{rows:>9} rows  {time.perf_counter() - start:7.1f}s  " + "  ".join(paths))
+
+
+if __name__ == "__main__":
+    main()
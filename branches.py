@@ -0,0 +1,102 @@
+import pandas as pd
+
+from months import month_columns
+
+# ============================
+# Branch Registry
+# ============================
+# One entry per branch workbook. The dashboard loads a branch only when it is
+# first selected, so adding a branch here costs nothing until it is opened.
+# "months" are read from the sales store (see sales_store.py) once the branch
+# has been ingested; until then "file" is read directly.
+BRANCHES = {
+    "Hilal": {
+        "file": "hilal oct sale.Xlsx",
+        "months": ["Oct-2025"],
+        "title": "📊hilal Sales & Profit Insights (Oct 2025)",
+    },
+    "Safa": {
+        "file": "oct sale safa.Xlsx",
+        "months": ["Oct-2025"],
+        "title": "📊Safa Sales & Profit Insights (OCT 2025)",
+    },
+    "Shams Salem": {
+        "file": "oct salem.Xlsx",
+        "months": ["Oct-2025"],
+        "title": "📊Shams salem Sales & Profit Insights (Oct 2025)",
+    },
+}
+
+ALL_BRANCHES = "All Branches"
+
+# Periods each branch can be compared across (see period_variance.py). A
+# period may read a subset of a workbook's months; Hilal has no Jul-Sep export.
+BASE_PERIOD = "Jul-Sep 2025"
+CURRENT_PERIOD = "Oct 2025"
+PERIODS = {
+    "Safa": {
+        BASE_PERIOD: {"file": "july to sep safa2025.Xlsx", "months": ["Jul-2025", "Aug-2025", "Sep-2025"]},
+        CURRENT_PERIOD: {"file": "oct sale safa.Xlsx", "months": ["Oct-2025"]},
+    },
+    "Shams Salem": {
+        BASE_PERIOD: {"file": "shams july to oct 16 sales(1).Xlsx", "months": ["Jul-2025", "Aug-2025", "Sep-2025"]},
+        CURRENT_PERIOD: {"file": "oct salem.Xlsx", "months": ["Oct-2025"]},
+    },
+    "Hilal": {
+        CURRENT_PERIOD: {"file": "hilal oct sale.Xlsx", "months": ["Oct-2025"]},
+    },
+}
+
+GP_OPTIONS = ['All', "<5%", "5-10%", "10-20%", "20-30%", "30%+"]
+GP_BINS = [-float('inf'), 5, 10, 20, 30, float('inf')]
+
+
+# ============================
+# Derived Columns
+# ============================
+def derive_totals(df):
+    # Fill missing categories
+    df['Category'] = df['Category'].fillna('Unknown')
+    # Calculate total sales and total profit
+    months = month_columns(df.columns)
+    sales_cols = [sales_col for sales_col, _ in months.values()]
+    profit_cols = [profit_col for _, profit_col in months.values()]
+    df['Total Sales'] = df[sales_cols].sum(axis=1)
+    df['Total Profit'] = df[profit_cols].sum(axis=1)
+    # Calculate GP%
+    df['GP%'] = (df['Total Profit'] / df['Total Sales'] * 100).round(2)
+    # Replace inf or NaN GP% with 0
+    df['GP%'] = df['GP%'].replace([float('inf'), -float('inf')], 0).fillna(0)
+    # GP% range used by the "Select GP% Range" filter
+    df['GP Band'] = gp_band(df['GP%'])
+    return df
+
+
+def gp_band(gp):
+    # Same half-open ranges as the "Select GP% Range" filter
+    return pd.cut(gp, bins=GP_BINS, labels=GP_OPTIONS[1:], right=False)
+
+
+# ============================
+# Per-branch Pre-aggregates
+# ============================
+def summarize_branch(df):
+    """Category x GP band rollup that the consolidated view is built from.
+
+    Keeping the GP% sum and item count lets the consolidated view reproduce
+    the per-item average GP% without touching item-level rows.
+    """
+    summary = (
+        df.groupby(['Category', 'GP Band'], observed=True)
+        .agg(
+            **{
+                'Total Sales': ('Total Sales', 'sum'),
+                'Total Profit': ('Total Profit', 'sum'),
+                'GP% Sum': ('GP%', 'sum'),
+                'Items': ('GP%', 'size'),
+            }
+        )
+        .reset_index()
+    )
+    summary['GP Band'] = summary['GP Band'].astype(str)
+    return summary
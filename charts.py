@@ -0,0 +1,111 @@
+import os
+
+import streamlit as st
+
+from gp_sketch import histogram_chart_frame, histogram_percentiles, sales_weighted_gp
+from perf_trace import stage
+
+# ============================
+# Deferred Charts
+# ============================
+# plotly is only imported, and a figure only built, when its section is
+# switched on. Figures are kept in the page's AggregateCache under the same
+# (dataset version, filter state) key as the aggregates they are drawn from,
+# so reruns that only page or sort the table don't rebuild them.
+
+CHARTS_OPEN = os.environ.get("SALES_CHARTS_OPEN", "0") == "1"
+
+
+def _px():
+    import plotly.express as px
+    return px
+
+
+def chart_section(title, key, build, cache, cache_key, empty_message=None):
+    """Heading plus an on/off toggle; build() -> list of figures runs only when on.
+
+    build does its own aggregation, so a closed section costs nothing. An
+    empty list shows empty_message instead. title=None leaves the heading
+    to the caller.
+    """
+    if title is not None:
+        st.markdown(f"### {title}")
+    if not st.toggle("Show charts", value=CHARTS_OPEN, key=f"charts_{key}"):
+        return
+    with stage("chart"):
+        figures = cache.get_or_compute(cache_key + ("chart", key), build)
+        if not figures:
+            if empty_message:
+                st.info(empty_message)
+            return
+        for fig in figures:
+            st.plotly_chart(fig, use_container_width=True)
+
+
+# ============================
+# Figure Builders
+# ============================
+def monthly_bar(monthly_df):
+    return _px().bar(
+        monthly_df, x='Month', y='Value', color='Type', barmode='group',
+        text='Value', title="Monthly Sales & Profit"
+    )
+
+
+def category_bars(category_summary):
+    px = _px()
+    return [
+        px.bar(category_summary, x='Category', y='Total Sales', color='Total Sales', text='Total Sales', title="Total Sales by Category"),
+        px.bar(category_summary, x='Category', y='Total Profit', color='Total Profit', text='Total Profit', title="Total Profit by Category"),
+        px.bar(category_summary, x='Category', y='GP', color='GP', text=category_summary['GP'].apply(lambda x:f"{x:.2%}"), title="Gross Profit % by Category"),
+    ]
+
+
+def negative_gp_bar(neg_count_by_category):
+    fig = _px().bar(
+        neg_count_by_category,
+        x='Category',
+        y='Negative Item Count',
+        text='Negative Item Count',
+        color='Negative Item Count',
+        color_continuous_scale='Reds',
+        title="Number of Items with Negative GP% by Category",
+    )
+    fig.update_traces(texttemplate='%{text}', textposition='outside')
+    fig.update_layout(
+        xaxis_title="Category",
+        yaxis_title="Count of Negative GP% Items",
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=500,
+        showlegend=False
+    )
+    return fig
+
+
+def gp_distribution_bar(hist):
+    return _px().bar(
+        histogram_chart_frame(hist), x='GP%', y='Items', hover_data=['Sales'],
+        title="Items by GP% (1-point bins)"
+    )
+
+
+# ============================
+# GP% Distribution
+# ============================
+def gp_distribution_section(hist, key, cache, cache_key):
+    """Percentiles and sales-weighted GP from a (merged) GP% histogram.
+
+    The per-item average is already under Key Insights, so it isn't repeated.
+    """
+    st.markdown("### 📈 GP% Distribution")
+    percentiles = histogram_percentiles(hist)
+    weighted = histogram_percentiles(hist, (0.5,), weight='Sales')
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Sales-weighted GP%", f"{sales_weighted_gp(hist)}%")
+    col2.metric("Median GP%", f"{percentiles[0.5]:.1f}%")
+    col3.metric("Sales-weighted median GP%", f"{weighted[0.5]:.1f}%")
+    st.caption("Item GP% percentiles: " + ", ".join(f"P{round(q * 100)} {value:.1f}%" for q, value in percentiles.items()))
+    chart_section(
+        None, key, lambda: [gp_distribution_bar(hist)] if len(hist) else [], cache, cache_key,
+        empty_message="No items match the selected filters.",
+    )
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from months import MONTH_COL_RE
+
+# ============================
+# Memory-compact dtypes
+# ============================
+# Column kinds for the sales and price-list workbooks. Month columns are
+# recognised by pattern and treated as money.
+SCHEMA = {
+    'Category': "category",
+    'GP Band': "category",
+    'Items': "text",
+    'Item Name': "text",
+    'Item Code': "text",
+    'Item Bar Code': "text",
+    'Total Sales': "money",
+    'Total Profit': "money",
+    'Cost': "money",
+    'Selling': "money",
+    'GP%': "money",
+    'Stock': "count",
+}
+
+TEXT_DTYPE = "string[pyarrow]"
+
+
+def column_kind(col):
+    if col in SCHEMA:
+        return SCHEMA[col]
+    if MONTH_COL_RE.match(str(col)):
+        return "money"
+    return None
+
+
+def _float32_is_lossless(values):
+    values = values.to_numpy(dtype="float64", na_value=np.nan)
+    return np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True)
+
+
+def compact_column(series, kind):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Already compact (e.g. barcode keys encoded for the price join)
+        return series
+    if kind == "category":
+        return series.astype("category")
+    if kind == "text" and (series.dtype == object or pd.api.types.is_string_dtype(series.dtype)):
+        # Numeric codes stay numeric; only Python/str columns move to Arrow
+        return series.astype(TEXT_DTYPE)
+    if kind == "money" and pd.api.types.is_float_dtype(series.dtype):
+        # Only when every value survives the round trip; most two-decimal
+        # prices do not, so in practice this mostly catches whole amounts
+        return series.astype("float32") if _float32_is_lossless(series) else series
+    if kind == "count" and pd.api.types.is_numeric_dtype(series.dtype) and not series.isna().any():
+        if (series == series.round()).all():
+            return pd.to_numeric(series.astype("int64"), downcast="integer")
+    return series
+
+
+def compact_frame(df):
+    """Downcast df's columns according to SCHEMA (unknown columns are left alone)."""
+    for col in df.columns:
+        kind = column_kind(col)
+        if kind is not None:
+            df[col] = compact_column(df[col], kind)
+    return df
+
+
+def fill_category(series, value):
+    """fillna that also works once a column has been made categorical."""
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+
+def memory_report(before, after):
+    """Per-column deep memory usage and dtypes before/after compaction."""
+    report = pd.DataFrame({
+        'dtype before': before.dtypes.astype(str),
+        'dtype after': after.dtypes.reindex(before.columns).astype(str),
+        'KB before': before.memory_usage(deep=True, index=False) / 1024,
+        'KB after': after.memory_usage(deep=True, index=False).reindex(before.columns) / 1024,
+    })
+    report.loc['Total'] = ['', '', report['KB before'].sum(), report['KB after'].sum()]
+    report['Saved %'] = (1 - report['KB after'] / report['KB before'].replace(0, np.nan)) * 100
+    return report.round(1)
@@ -0,0 +1,253 @@
+import os
+import time
+
+import streamlit as st
+import pandas as pd
+
+from agg_cache import AggregateCache
+from branches import ALL_BRANCHES, BRANCHES, GP_OPTIONS, derive_totals
+from charts import gp_distribution_section
+from debug_panel import memory_panel, start_rerun_trace, timing_panel
+from filter_index import build_filter_index, display_columns
+from gp_sketch import merge_histograms
+from perf_trace import stage
+from reports import filter_items
+from rollup_cube import cube_category_summary, cube_insights, cube_negative_gp, load_cube, slice_cube
+from sales_store import dataset_version, load_sales
+from shared_store import shared_items
+from source_watch import SourceWatch
+from table_view import export_panel, paginated_table
+
+# ============================
+# Load Data
+# ============================
+# One watcher per process, shared by every session: a replaced workbook is
+# reloaded in the background and swapped in, one branch at a time
+@st.cache_resource
+def source_watch():
+    return SourceWatch()
+
+
+def branch_version(branch):
+    info = BRANCHES[branch]
+    try:
+        return dataset_version(info["file"], branch, info.get("months"))
+    except OSError:
+        return None  # Missing workbook; the load reports it
+
+
+def build_branch(branch):
+    # Read-only frame attached from the shared store (see shared_store.py),
+    # with its filter index and rollup cube, so they always change together
+    info = BRANCHES[branch]
+    df = shared_items(info["file"], branch, info.get("months"))
+    return {
+        "items": df,
+        "filter_index": build_filter_index(df),
+        "cube": load_cube(info["file"], branch, info.get("months")),
+    }
+
+
+def load_data(branch):
+    try:
+        return source_watch().get(branch, lambda: branch_version(branch), lambda: build_branch(branch))
+    except Exception as e:
+        st.error(f"Error loading file: {e}")
+        return None, None
+
+
+def build_branch_summaries():
+    # Per-branch rollups and GP% histograms for the consolidated view, read
+    # from each branch's persisted rollup cube: its "bands" table is
+    # summarize_branch's output and "hist" the branch's GP% histogram, so no
+    # item rows are loaded once the cubes exist
+    summaries, histograms, timings = {}, {}, []
+    for branch, info in BRANCHES.items():
+        start = time.perf_counter()
+        timing = {"name": branch, "file": os.path.basename(info["file"]), "error": None}
+        try:
+            cube = load_cube(info["file"], branch, info.get("months"))
+            summaries[branch] = cube["bands"].assign(Branch=branch)
+            histograms[branch] = cube["hist"].assign(Branch=branch)
+        except Exception as e:
+            timing["error"] = str(e)
+        timing["load_s"] = round(time.perf_counter() - start, 3)
+        timings.append(timing)
+    return summaries, histograms, pd.DataFrame(timings)
+
+
+def load_branch_summaries():
+    return source_watch().get(
+        ALL_BRANCHES, lambda: tuple(branch_version(branch) for branch in BRANCHES), build_branch_summaries,
+    )
+
+
+# Shared by all sessions; keyed by (dataset version, filter state)
+@st.cache_resource
+def aggregate_cache():
+    return AggregateCache()
+
+
+def reload_notice(key):
+    watch = source_watch()
+    if watch.reloading(key):
+        st.caption("🔄 Newer data found; reloading in the background.")
+    elif watch.error(key) is not None:
+        st.warning(f"Showing the last good data; reloading failed: {watch.error(key)}")
+
+
+# ============================
+# Filters
+# ============================
+def sidebar_filters(categories):
+    st.sidebar.header("Filters")
+
+    # Category filter (single selection with "All")
+    selected_category = st.sidebar.selectbox("Select Category", options=['All'] + categories, index=0)
+
+    # Exclude category (multiselect)
+    exclude_categories = st.sidebar.multiselect("Exclude Categories", options=categories)
+
+    # GP% filter (single selection with "All")
+    selected_gp = st.sidebar.selectbox("Select GP% Range", options=GP_OPTIONS, index=0)
+    return selected_category, exclude_categories, selected_gp
+
+
+def apply_filters(data, selected_category, exclude_categories, selected_gp):
+    # Slice only the selected rows via the precomputed index (no full-frame copy)
+    rows = filter_items(data["items"], selected_category, exclude_categories, selected_gp, data["filter_index"])
+    return display_columns(rows)
+
+
+def show_key_insights(total_sales, total_profit, avg_gp):
+    st.markdown("### Key Insights")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Total Sales", f"{total_sales:,.0f}")
+    col2.metric("Total Profit", f"{total_profit:,.0f}")
+    col3.metric("Average GP%", f"{avg_gp}%")
+
+
+# ============================
+# Single Branch View
+# ============================
+def render_branch(branch):
+    st.title(BRANCHES[branch]["title"])
+    with stage("load"):
+        version, data = load_data(branch)
+
+    if data is None or data["items"].empty:
+        st.warning("No data loaded. Please check the file.")
+        return
+    reload_notice(branch)
+    df = data["items"]
+
+    filters = sidebar_filters(df['Category'].unique().tolist())
+    with stage("filter"):
+        filtered_df = apply_filters(data, *filters)
+
+    with stage("aggregate"):
+        filter_key = (branch, version, filters[0], tuple(sorted(filters[1])), filters[2])
+        cube = slice_cube(data["cube"], *filters)
+        insights = cube_insights(cube)
+    show_key_insights(insights['total_sales'], insights['total_profit'], insights['avg_gp'])
+    gp_distribution_section(cube["hist"], f"gp_distribution_{branch}", aggregate_cache(), filter_key)
+
+    st.markdown("### Filtered Items")
+    if filtered_df.empty:
+        st.info("No items match the selected filters.")
+    else:
+        with stage("table"):
+            paginated_table(filtered_df.reset_index(drop=True), key=f"items_{branch}")
+        export_panel({
+            "Filtered Items": filtered_df,
+            "Category Summary": lambda: cube_category_summary(cube),
+            "Negative GP by Category": lambda: cube_negative_gp(cube),
+            "GP% Histogram": lambda: merge_histograms(cube["hist"]),
+        }, key=f"export_{branch}")
+
+    info = BRANCHES[branch]
+    memory_panel({branch: (lambda: derive_totals(load_sales(info["file"], branch, info.get("months"))), df)})
+
+
+# ============================
+# Consolidated View
+# ============================
+def render_all_branches():
+    st.title("📊 All Branches Sales & Profit Insights")
+    with stage("load"):
+        version, (summaries, histograms, timings) = load_branch_summaries()
+    reload_notice(ALL_BRANCHES)
+    for error in timings['error'].dropna():
+        st.error(f"Error loading file: {error}")
+
+    if not summaries:
+        st.warning("No data loaded. Please check the files.")
+        return
+
+    summary = pd.concat(summaries.values(), ignore_index=True)
+    hist = pd.concat(histograms.values(), ignore_index=True)
+    selected_category, exclude_categories, selected_gp = sidebar_filters(sorted(summary['Category'].unique().tolist()))
+    selected_branches = st.sidebar.multiselect("Compare Branches", options=list(summaries), default=list(summaries))
+    with stage("filter"):
+        # Summaries and histograms share Branch / Category / GP Band, so both
+        # are sliced the same way
+        frames = []
+        for frame in (summary, hist):
+            keep = frame['Branch'].isin(selected_branches)
+            if selected_category != 'All':
+                keep &= frame['Category'] == selected_category
+            if exclude_categories:
+                keep &= ~frame['Category'].isin(exclude_categories)
+            if selected_gp != 'All':
+                keep &= frame['GP Band'] == selected_gp
+            frames.append(frame[keep])
+        summary, hist = frames
+
+    with stage("aggregate"):
+        filter_key = (
+            ALL_BRANCHES, version, tuple(selected_branches), selected_category,
+            tuple(sorted(exclude_categories)), selected_gp,
+        )
+        items = summary['Items'].sum()
+        avg_gp = round(summary['GP% Sum'].sum() / items, 2) if items else 0
+    show_key_insights(summary['Total Sales'].sum(), summary['Total Profit'].sum(), avg_gp)
+    # Selected branches' histograms are merged, not rescanned
+    gp_distribution_section(hist, "gp_distribution_all", aggregate_cache(), filter_key)
+
+    st.markdown("### Branch & Category Summary")
+    if summary.empty:
+        st.info("No items match the selected filters.")
+        return
+    with stage("aggregate"):
+        by_category = summary.groupby(['Branch', 'Category'], as_index=False)[
+            ['Total Sales', 'Total Profit', 'GP% Sum', 'Items']
+        ].sum()
+        by_category['Average GP%'] = (by_category['GP% Sum'] / by_category['Items']).round(2)
+    with stage("table"):
+        st.dataframe(by_category.drop(columns='GP% Sum'))
+    export_panel({"Branch & Category Summary": by_category.drop(columns='GP% Sum')}, key="export_all_branches")
+
+    with st.expander("⏱ Cube load timings"):
+        st.dataframe(timings)
+
+
+# ============================
+# App Entry Point
+# ============================
+def run_dashboard(default_branch=None):
+    st.set_page_config(page_title="Sales & Profit Dashboard", layout="wide")
+
+    options = list(BRANCHES) + [ALL_BRANCHES]
+    index = options.index(default_branch) if default_branch in options else 0
+    branch = st.sidebar.selectbox("Branch", options=options, index=index)
+    start_rerun_trace(f"dashboard:{branch}")
+
+    if branch == ALL_BRANCHES:
+        render_all_branches()
+    else:
+        render_branch(branch)
+    timing_panel()
+
+
+if __name__ == "__main__":
+    run_dashboard()
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+from openpyxl.utils.exceptions import InvalidFileException
+
+from excel_stream import read_excel_streaming
+
+# ============================
+# Columnar sidecar cache for Excel workbooks
+# ============================
+# Each workbook is parsed through openpyxl once and written to a Parquet file
+# under CACHE_DIR. Later loads (including after a restart or from another
+# worker process) read the Parquet file instead, as long as the source
+# workbook is unchanged.
+
+CACHE_DIR = os.environ.get("SALES_CACHE_DIR", ".sales_cache")
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_hash(file_path):
+    h = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _sidecar_paths(file_path, read_kwargs):
+    # One sidecar per (absolute path, read_excel arguments)
+    key_src = os.path.abspath(file_path) + "|" + json.dumps(read_kwargs, sort_keys=True, default=str)
+    key = hashlib.sha1(key_src.encode("utf-8")).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(file_path))[0].replace(" ", "_")
+    base = os.path.join(CACHE_DIR, f"{stem}-{key}")
+    return base + ".parquet", base + ".json"
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_atomic(path, write):
+    # Write to a temp file and rename so concurrent workers never see a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_meta(meta_path, meta):
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    write_atomic(meta_path, write)
+
+
+def source_fingerprint(file_path):
+    st_info = os.stat(file_path)
+    return {
+        "path": os.path.abspath(file_path),
+        "size": st_info.st_size,
+        "mtime_ns": st_info.st_mtime_ns,
+    }
+
+
+def _fresh_sidecar(file_path, read_kwargs):
+    # Sidecar path if it still matches the workbook, else None
+    parquet_path, meta_path = _sidecar_paths(file_path, read_kwargs)
+    fingerprint = source_fingerprint(file_path)
+    meta = _read_meta(meta_path)
+
+    if meta is not None and os.path.exists(parquet_path):
+        same_stat = meta.get("size") == fingerprint["size"] and meta.get("mtime_ns") == fingerprint["mtime_ns"]
+        if same_stat:
+            return parquet_path
+        if meta.get("size") == fingerprint["size"]:
+            digest = file_hash(file_path)
+            if digest == meta.get("sha1"):
+                _write_meta(meta_path, {**fingerprint, "sha1": digest})
+                return parquet_path
+    return None
+
+
+def read_excel_cached(file_path, **read_kwargs):
+    """Drop-in replacement for pd.read_excel backed by a Parquet sidecar.
+
+    The sidecar is reused when the workbook's size and mtime are unchanged.
+    If only the mtime moved (file copied or touched), the content hash is
+    compared before deciding to re-parse.
+    """
+    parquet_path = _fresh_sidecar(file_path, read_kwargs)
+    if parquet_path is not None:
+        return pd.read_parquet(parquet_path)
+    parquet_path, meta_path = _sidecar_paths(file_path, read_kwargs)
+    fingerprint = source_fingerprint(file_path)
+
+    df = None
+    if set(read_kwargs) <= {"usecols"}:
+        try:
+            # Streams rows in chunks; same result as pd.read_excel, lower peak memory
+            df = read_excel_streaming(file_path, usecols=read_kwargs.get("usecols"))
+        except InvalidFileException:
+            # openpyxl goes by the file extension; read_excel sniffs the content
+            pass
+    if df is None:
+        df = pd.read_excel(file_path, **read_kwargs)
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        write_atomic(parquet_path, lambda tmp_path: df.to_parquet(tmp_path, index=False))
+        _write_meta(meta_path, {**fingerprint, "sha1": file_hash(file_path)})
+    except Exception:
+        # Columns with mixed Python types (or a missing pyarrow) can't be
+        # stored as Parquet; serve the parsed frame without caching it.
+        pass
+    return df
+
+
+def cached_parquet_path(file_path):
+    """Path of the workbook's Parquet sidecar, refreshing it first.
+
+    For readers that scan the Parquet file directly (see sql_engine.py);
+    None when the workbook could not be stored as Parquet.
+    """
+    parquet_path = _fresh_sidecar(file_path, {})
+    if parquet_path is None:
+        read_excel_cached(file_path)
+        parquet_path = _fresh_sidecar(file_path, {})
+    return parquet_path
+
+
+def clear_cache(file_path=None):
+    """Remove cached sidecars, either for one workbook or all of them (with the rollup cubes)."""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    stem = None
+    if file_path is not None:
+        stem = os.path.splitext(os.path.basename(file_path))[0].replace(" ", "_") + "-"
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if os.path.isdir(path):
+            # Subdirectories (rollup cubes) are only dropped with everything else
+            if stem is None:
+                shutil.rmtree(path)
+        elif stem is None or name.startswith(stem):
+            os.remove(path)
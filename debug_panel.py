@@ -0,0 +1,61 @@
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from compact import memory_report
+from perf_trace import finish_trace, start_trace
+
+# ============================
+# Debug Panel
+# ============================
+# Opt-in diagnostics toggled from the sidebar. Nothing here runs unless the
+# checkbox is ticked, so the panels cost nothing on a normal rerun.
+
+
+def memory_panel(frames):
+    """Memory before/after the dtype pass for each loaded frame.
+
+    frames maps a label to (load_raw, compact_df); load_raw is only called
+    when the panel is open.
+    """
+    if not st.sidebar.checkbox("Debug: memory report"):
+        return
+    st.markdown("### 🧠 Memory Report")
+    for name, (load_raw, df) in frames.items():
+        report = memory_report(load_raw(), df)
+        total = report.loc['Total']
+        st.markdown(f"**{name}**: {total['KB before']:,.0f} KB → {total['KB after']:,.0f} KB")
+        st.dataframe(report)
+
+
+def start_rerun_trace(page):
+    """Open the stage trace for this rerun (see perf_trace.py)."""
+    previous = st.session_state.get("_rerun_trace")
+    if previous is not None and not previous["finished"]:
+        # The last rerun ended early (st.stop, an exception); log what it got through
+        previous["incomplete"] = True
+        finish_trace(previous)
+    ctx = get_script_run_ctx()
+    st.session_state["_rerun_trace"] = start_trace(page, session=ctx.session_id if ctx is not None else None)
+
+
+def timing_panel():
+    """Close this rerun's trace and, if enabled, show its per-stage timings.
+
+    Call once, at the end of the script; the trace is written to
+    SALES_TRACE_LOG whether or not the panel is open.
+    """
+    trace = finish_trace()
+    if trace is None or not st.sidebar.checkbox("Debug: stage timings"):
+        return
+    st.markdown("### ⏱ Stage Timings (this rerun)")
+    stages = pd.DataFrame(trace["stages"], columns=["stage", "depth", "seconds", "rss_delta_mb"])
+    top_level = stages.loc[stages['depth'] == 0, 'seconds'].sum()
+    st.markdown(
+        f"**Total** {trace['total_seconds'] * 1000:,.1f} ms, "
+        f"in stages {top_level * 1000:,.1f} ms, RSS {trace['rss_end_mb']} MB"
+    )
+    # Nested stages (cache misses inside a load, say) are indented under their parent
+    stages['stage'] = ["\u2003" * depth + name for depth, name in zip(stages.pop('depth'), stages['stage'])]
+    stages['ms'] = (stages.pop('seconds') * 1000).round(2)
+    st.dataframe(stages)
@@ -0,0 +1,120 @@
+import pandas as pd
+from openpyxl import load_workbook
+from pandas.api.types import union_categoricals
+from pandas.io.parsers import TextParser
+
+# ============================
+# Streaming Excel Reader
+# ============================
+# pd.read_excel collects every row of the sheet as a list of Python objects
+# before it builds any columns, so peak memory while parsing a large export is
+# several times the final frame. Here rows are pulled from openpyxl's
+# read-only (streaming) worksheet and turned into a DataFrame CHUNK_SIZE rows
+# at a time, with the same cell conversion and type inference as read_excel.
+
+CHUNK_SIZE = 5000
+
+
+def _convert(value):
+    # Same cell conversion as pandas' openpyxl reader
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _trim(values):
+    values = list(values)
+    while values and values[-1] == "":
+        values.pop()
+    return values
+
+
+def iter_excel_chunks(file_path, chunk_size=CHUNK_SIZE, usecols=None, sheet=0):
+    """Yield DataFrames of up to chunk_size rows from one worksheet.
+
+    Column names come from the first row; usecols keeps only those columns.
+    Columns holding text cells are yielded as raw objects (see
+    concat_chunks), everything else is already typed.
+    """
+    book = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        worksheet = book.worksheets[sheet]
+        worksheet.reset_dimensions()
+        rows = worksheet.iter_rows(values_only=True)
+        header = _trim(_convert(value) for value in next(rows, ()))
+        # Cells outside usecols are never converted or buffered
+        keep = range(len(header)) if usecols is None else [header.index(col) for col in usecols]
+        header = [header[pos] for pos in keep]
+        width = len(header)
+        span = max(keep, default=-1) + 1
+
+        chunk, blank_run = [], []
+        for row in rows:
+            if all(value is None or value == "" for value in row):
+                # Blank rows are kept only when more data follows them
+                blank_run.append([""] * width)
+                continue
+            if len(row) < span:
+                row = row + (None,) * (span - len(row))
+            chunk.extend(blank_run)
+            blank_run = []
+            chunk.append([_convert(row[pos]) for pos in keep])
+            if len(chunk) >= chunk_size:
+                yield _parse_chunk(header, chunk)
+                chunk = []
+        if chunk:
+            yield _parse_chunk(header, chunk)
+    finally:
+        book.close()
+
+
+def _parse_chunk(header, chunk):
+    # read_excel decides whether text like "00123" becomes a number by looking
+    # at the whole column, which one chunk can't do; such columns stay raw
+    text_cols = [
+        pos for pos in range(len(header))
+        if any(isinstance(row[pos], str) and row[pos] != "" for row in chunk)
+    ]
+    df = TextParser(
+        [header] + chunk, header=0, skip_blank_lines=False, dtype={pos: object for pos in text_cols},
+    ).read()
+    df.attrs["raw_columns"] = [df.columns[pos] for pos in text_cols]
+    return df
+
+
+def _infer_column(name, values):
+    # Same inference read_excel applies to a complete column
+    values = ["" if pd.isna(value) else value for value in values]
+    return TextParser([[name]] + [[value] for value in values], header=0, skip_blank_lines=False).read()[name]
+
+
+def concat_chunks(chunks):
+    """Concatenate chunk frames into one frame with whole-column dtypes.
+
+    Raw text columns are typed over all their values at once, and per-chunk
+    categoricals are merged into a single dtype.
+    """
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame()
+    raw_columns = set().union(*(chunk.attrs.get("raw_columns", ()) for chunk in chunks))
+    columns = {}
+    for col in chunks[0].columns:
+        parts = [chunk[col] for chunk in chunks]
+        dtypes = {part.dtype for part in parts}
+        if col in raw_columns:
+            columns[col] = _infer_column(col, pd.concat(parts, ignore_index=True).astype(object))
+        elif len(dtypes) > 1 and all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+            # Each chunk only saw its own categories
+            columns[col] = pd.Series(union_categoricals(parts, sort_categories=True))
+        else:
+            columns[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def read_excel_streaming(file_path, chunk_size=CHUNK_SIZE, usecols=None):
+    """pd.read_excel(file_path) with bounded parse-time memory."""
+    return concat_chunks(iter_excel_chunks(file_path, chunk_size, usecols))
+
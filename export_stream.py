@@ -0,0 +1,47 @@
+import csv
+import os
+
+import numpy as np
+from openpyxl import Workbook
+
+# ============================
+# Streaming Table Export
+# ============================
+# Tables are written EXPORT_CHUNK_ROWS rows at a time: CSV by appending each
+# chunk, XLSX through openpyxl's write-only workbook, which streams rows to a
+# temporary file instead of building the sheet in memory. Peak memory is one
+# chunk of Python values, however many rows are exported.
+
+EXPORT_CHUNK_ROWS = int(os.environ.get("SALES_EXPORT_CHUNK_ROWS", "10000"))
+FORMATS = ["csv", "xlsx"]
+MAX_SHEET_TITLE = 31
+
+
+def iter_chunks(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def cell_rows(chunk):
+    """Rows of plain Python values; missing and infinite values become None."""
+    values = chunk.replace([np.inf, -np.inf], np.nan).astype(object)
+    return values.where(values.notna(), None).to_numpy().tolist()
+
+
+def write_csv(df, path, chunk_rows=EXPORT_CHUNK_ROWS):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerow([str(col) for col in df.columns])
+        for chunk in iter_chunks(df, chunk_rows):
+            chunk.to_csv(f, header=False, index=False)
+
+
+def write_xlsx(tables, path, chunk_rows=EXPORT_CHUNK_ROWS):
+    """One worksheet per {name: frame} entry."""
+    book = Workbook(write_only=True)
+    for name, df in tables.items():
+        sheet = book.create_sheet(title=str(name)[:MAX_SHEET_TITLE])
+        sheet.append([str(col) for col in df.columns])
+        for chunk in iter_chunks(df, chunk_rows):
+            for row in cell_rows(chunk):
+                sheet.append(row)
+    book.save(path)
@@ -0,0 +1,47 @@
+import numpy as np
+
+# ============================
+# Category x GP band row index
+# ============================
+# Row positions for every (Category, GP Band) pair are grouped once per loaded
+# frame. Any mix of include-category, exclude-categories and GP band is then
+# answered by concatenating the matching position arrays, so each rerun
+# touches only the rows it ends up showing.
+
+# Columns that only serve the filters; kept out of item tables and exports
+FILTER_COLUMNS = ['GP Band']
+
+
+def build_filter_index(df):
+    groups = df.groupby(['Category', 'GP Band'], observed=True, sort=False).indices
+    return {
+        "n_rows": len(df),
+        "categories": df['Category'].unique().tolist(),
+        "bands": df['GP Band'].cat.categories.tolist(),
+        "rows": {key: rows.astype(np.int64) for key, rows in groups.items()},
+    }
+
+
+def select_rows(index, selected_category='All', exclude_categories=(), selected_gp='All'):
+    """Sorted row positions matching the sidebar filters."""
+    if selected_category == 'All' and not exclude_categories and selected_gp == 'All':
+        return np.arange(index["n_rows"])
+
+    categories = index["categories"] if selected_category == 'All' else [selected_category]
+    excluded = set(exclude_categories)
+    bands = index["bands"] if selected_gp == 'All' else [selected_gp]
+
+    parts = [
+        index["rows"][(category, band)]
+        for category in categories if category not in excluded
+        for band in bands if (category, band) in index["rows"]
+    ]
+    if not parts:
+        return np.empty(0, dtype=np.int64)
+    # Keep the original row order
+    return np.sort(np.concatenate(parts))
+
+
+def display_columns(df):
+    """df without the filter-only columns."""
+    return df.drop(columns=[col for col in FILTER_COLUMNS if col in df.columns])
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+from branches import gp_band
+
+# ============================
+# Mergeable GP% histograms
+# ============================
+# Items are counted into fixed 1-point GP% bins (with one underflow and one
+# overflow bin), per category, together with their sales and profit. Bins
+# line up everywhere, so histograms for any mix of branches and categories
+# merge by adding counts, and percentiles, sales-weighted GP and the
+# distribution chart come from a few hundred rows instead of the items.
+#
+# The GP% filter bands (see branches.GP_BINS) fall on bin edges, so each bin
+# also carries its band and a histogram can be sliced like the rollup cube.
+
+GP_MIN = -100
+GP_MAX = 100
+UNDERFLOW = GP_MIN - 1
+DEFAULT_PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def gp_bin(gp):
+    """Left edge of each value's bin; UNDERFLOW below GP_MIN, GP_MAX at or above it."""
+    return np.clip(np.floor(np.asarray(gp, dtype="float64")), UNDERFLOW, GP_MAX).astype(np.int64)
+
+
+def gp_histogram(df, by=('Category',)):
+    """Items, Sales and Profit per (by..., GP% Bin) for a derive_totals frame."""
+    by = list(by)
+    keys = {col: df[col].astype(str).to_numpy() for col in by}
+    hist = (
+        pd.DataFrame({
+            **keys,
+            'GP% Bin': gp_bin(df['GP%']),
+            'Sales': df['Total Sales'].to_numpy(dtype="float64"),
+            'Profit': df['Total Profit'].to_numpy(dtype="float64"),
+        })
+        .groupby(by + ['GP% Bin'])
+        .agg(Items=('Sales', 'size'), Sales=('Sales', 'sum'), Profit=('Profit', 'sum'))
+        .reset_index()
+    )
+    hist['GP Band'] = gp_band(hist['GP% Bin']).astype(str)
+    return hist
+
+
+def merge_histograms(*hists):
+    """One histogram (GP% Bin, Items, Sales, Profit) summed over every input row."""
+    merged = pd.concat(hists, ignore_index=True) if len(hists) > 1 else hists[0]
+    return (
+        merged.groupby('GP% Bin', as_index=False)[['Items', 'Sales', 'Profit']]
+        .sum()
+        .sort_values('GP% Bin')
+        .reset_index(drop=True)
+    )
+
+
+def histogram_percentiles(hist, percentiles=DEFAULT_PERCENTILES, weight='Items'):
+    """GP% at each percentile, interpolated inside 1-point bins.
+
+    weight='Sales' gives sales-weighted percentiles (negative sales count as
+    zero). Percentiles landing in the underflow/overflow bins are reported
+    as GP_MIN / GP_MAX.
+    """
+    hist = merge_histograms(hist)
+    weights = np.clip(hist[weight].to_numpy(dtype="float64"), 0, None)
+    total = weights.sum()
+    if total == 0:
+        return {q: 0.0 for q in percentiles}
+    edges = hist['GP% Bin'].to_numpy()
+    cumulative = np.cumsum(weights)
+    result = {}
+    for q in percentiles:
+        target = q * total
+        i = min(int(np.searchsorted(cumulative, target, side="left")), len(edges) - 1)
+        if edges[i] == UNDERFLOW:
+            result[q] = float(GP_MIN)
+        elif edges[i] >= GP_MAX:
+            result[q] = float(GP_MAX)
+        else:
+            below = cumulative[i] - weights[i]
+            result[q] = float(edges[i] + (target - below) / weights[i]) if weights[i] else float(edges[i])
+    return result
+
+
+def sales_weighted_gp(hist):
+    """Total profit over total sales, in percent."""
+    sales = hist['Sales'].sum()
+    return round(hist['Profit'].sum() / sales * 100, 2) if sales != 0 else 0
+
+
+def histogram_chart_frame(hist):
+    """GP%-range / Items / Sales rows for a bar chart.
+
+    One row per bin from UNDERFLOW to GP_MAX, empty bins included, so the x
+    axis never skips GP% values.
+    """
+    hist = (
+        merge_histograms(hist)
+        .set_index('GP% Bin')
+        .reindex(np.arange(UNDERFLOW, GP_MAX + 1), fill_value=0)
+        .rename_axis('GP% Bin')
+        .reset_index()
+    )
+    labels = np.where(
+        hist['GP% Bin'] == UNDERFLOW, f"<{GP_MIN}",
+        np.where(hist['GP% Bin'] >= GP_MAX, f"{GP_MAX}+", hist['GP% Bin'].astype(str)),
+    )
+    return pd.DataFrame({
+        'GP%': labels,
+        'Items': hist['Items'].to_numpy(),
+        'Sales': hist['Sales'].to_numpy(),
+    })
@@ -0,0 +1,119 @@
+import calendar
+
+import numpy as np
+import pandas as pd
+
+from months import month_key
+from totals import safe_ratio
+
+# ============================
+# Inventory analytics
+# ============================
+# Stock cover, stock value and margin checks for every price-list item,
+# computed column-at-a-time over the price/sales join (see price_join.py) and
+# rolled up per category once per loaded pair of files.
+#
+# Units sold are not in the exports, only sales value, so daily units are
+# estimated as Total Sales / Selling spread over the calendar days of the
+# months covered. A price-list item that matched several sales rows (repeated
+# item codes) counts its stock once and the sales of all of them.
+
+
+def period_days(months):
+    """Calendar days covered by the given "<Mon>-<YYYY>" months."""
+    days = 0
+    for month in months:
+        start = month_key(month)
+        days += calendar.monthrange(start.year, start.month)[1]
+    return days
+
+
+def _numeric(series):
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def days_of_cover(stock, daily_units):
+    """Stock / daily units; infinite for stock that isn't selling, 0 with no stock."""
+    cover = safe_ratio(stock, daily_units)
+    return np.where((daily_units <= 0) & (stock > 0), np.inf, cover)
+
+
+def build_inventory(join, view):
+    """Per-item inventory figures plus their per-category rollup.
+
+    join is build_price_sales_join's result and view the month view of its
+    joined frame. Returns {"items": one row per price-list item, in
+    price-list order, "by_category": one row per category}.
+    """
+    items = view["items"]
+    offsets = join["offsets"]
+    first = offsets[:-1]
+    # Sales of every joined row belonging to each price-list row
+    total_sales = np.add.reduceat(items['Total Sales'].to_numpy(dtype="float64"), first)
+    total_profit = np.add.reduceat(items['Total Profit'].to_numpy(dtype="float64"), first)
+
+    price_items = items.iloc[first]
+    stock = np.nan_to_num(_numeric(price_items['Stock']))
+    cost = _numeric(price_items['Cost'])
+    selling = _numeric(price_items['Selling'])
+
+    daily_units = safe_ratio(safe_ratio(total_sales, np.nan_to_num(selling)), period_days(view["months"]))
+    stock_value = stock * np.nan_to_num(cost)
+    list_margin = safe_ratio(np.nan_to_num(selling - cost), np.nan_to_num(selling))
+    realized_gp = safe_ratio(total_profit, total_sales)
+    # No sales in any month (months with no activity carry no facts at all)
+    dead = (stock > 0) & (total_sales == 0)
+
+    inventory = pd.DataFrame({
+        'Item Bar Code': price_items['Item Bar Code'].to_numpy(),
+        'Item Name': price_items['Item Name'].to_numpy(),
+        'Category': price_items['Category'].to_numpy(),
+        'Cost': cost,
+        'Selling': selling,
+        'Stock': stock,
+        'Total Sales': total_sales,
+        'Total Profit': total_profit,
+        'Stock Value': stock_value,
+        'Daily Units': daily_units,
+        'Days of Cover': days_of_cover(stock, daily_units),
+        'List Margin': list_margin,
+        'Realized GP': realized_gp,
+        'Margin Gap': list_margin - realized_gp,
+        'Dead Stock': dead,
+    })
+    return {"items": inventory, "by_category": category_inventory(inventory)}
+
+
+def category_inventory(inventory):
+    """Per-category stock value, cover, dead stock and list vs realized margin."""
+    grouped = inventory.assign(
+        **{
+            'Dead Stock Value': np.where(inventory['Dead Stock'], inventory['Stock Value'], 0.0),
+            # Sales-weighted, so the category's list margin compares with its realized GP
+            '_weighted_margin': inventory['List Margin'] * inventory['Total Sales'],
+        }
+    ).groupby('Category', observed=True)
+    summary = grouped.agg(
+        **{
+            'SKUs': ('Stock', 'size'),
+            'Stock': ('Stock', 'sum'),
+            'Stock Value': ('Stock Value', 'sum'),
+            'Daily Units': ('Daily Units', 'sum'),
+            'Dead SKUs': ('Dead Stock', 'sum'),
+            'Dead Stock Value': ('Dead Stock Value', 'sum'),
+            'Total Sales': ('Total Sales', 'sum'),
+            'Total Profit': ('Total Profit', 'sum'),
+            '_weighted_margin': ('_weighted_margin', 'sum'),
+        }
+    ).reset_index()
+    summary['Days of Cover'] = days_of_cover(summary['Stock'].to_numpy(), summary['Daily Units'].to_numpy())
+    summary['List Margin'] = safe_ratio(summary.pop('_weighted_margin'), summary['Total Sales'])
+    summary['Realized GP'] = safe_ratio(summary['Total Profit'], summary['Total Sales'])
+    summary['Margin Gap'] = summary['List Margin'] - summary['Realized GP']
+    return summary.sort_values('Stock Value', ascending=False, kind="stable").reset_index(drop=True)
+
+
+def dead_stock(inventory):
+    """Items with stock on hand and no sales in any month, largest stock value first."""
+    dead = inventory[inventory['Dead Stock'].to_numpy()]
+    return dead.sort_values('Stock Value', ascending=False, kind="stable")
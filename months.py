@@ -0,0 +1,130 @@
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from totals import safe_ratio
+
+# ============================
+# Month column discovery
+# ============================
+# Exports carry one "<Mon>-<YYYY> Total Sales" / "<Mon>-<YYYY> Total Profit"
+# pair per month. Nothing downstream hardcodes which months exist; they are
+# discovered from the column names.
+MONTH_COL_RE = re.compile(r"^(?P<month>[A-Z][a-z]{2}-\d{4}) Total (?P<measure>Sales|Profit)$")
+
+
+def month_key(month):
+    return datetime.strptime(month, "%b-%Y")
+
+
+def month_columns(columns):
+    """{month: (sales_col, profit_col)} for every complete month pair, oldest first."""
+    found = {}
+    for col in columns:
+        match = MONTH_COL_RE.match(str(col))
+        if match:
+            found.setdefault(match['month'], {})[match['measure']] = col
+    return {
+        month: (cols['Sales'], cols['Profit'])
+        for month, cols in sorted(found.items(), key=lambda item: month_key(item[0]))
+        if len(cols) == 2
+    }
+
+
+# ============================
+# Long (item, month) form
+# ============================
+def to_long(df, months=None):
+    """Tidy Item/Month/Sales/Profit facts for a wide export frame.
+
+    Item is the row position in df and Month an ordered categorical. Months
+    where an item has neither sales nor profit are left out, so the frame
+    grows with actual activity rather than with items x months.
+    """
+    months = month_columns(df.columns) if months is None else months
+    n_items = len(df)
+    labels = list(months)
+
+    sales = np.zeros((n_items, len(labels)))
+    profit = np.zeros((n_items, len(labels)))
+    for code, (sales_col, profit_col) in enumerate(months.values()):
+        sales[:, code] = np.nan_to_num(df[sales_col].to_numpy(dtype="float64", na_value=np.nan))
+        profit[:, code] = np.nan_to_num(df[profit_col].to_numpy(dtype="float64", na_value=np.nan))
+
+    # Row-major scan keeps facts ordered by item, then month
+    item_idx, month_idx = np.nonzero((sales != 0) | (profit != 0))
+    return pd.DataFrame({
+        'Item': item_idx.astype(np.int32),
+        'Month': pd.Categorical.from_codes(month_idx, categories=labels, ordered=True),
+        'Sales': sales[item_idx, month_idx],
+        'Profit': profit[item_idx, month_idx],
+    })
+
+
+def build_month_view(df):
+    """Split a wide frame into item attributes plus long month facts.
+
+    The returned "items" frame has the month columns replaced by Total Sales,
+    Total Profit and Overall GP; per-month figures stay in "long".
+    """
+    months = month_columns(df.columns)
+    month_cols = [col for pair in months.values() for col in pair]
+    long = to_long(df, months)
+
+    items = df.drop(columns=month_cols).reset_index(drop=True)
+    # Facts are in month order per item, so this matches a left-to-right sum
+    total_sales = np.bincount(long['Item'], weights=long['Sales'], minlength=len(df))
+    total_profit = np.bincount(long['Item'], weights=long['Profit'], minlength=len(df))
+    items['Total Sales'] = total_sales
+    items['Total Profit'] = total_profit
+    items['Overall GP'] = safe_ratio(total_profit, total_sales)
+
+    offsets = np.zeros(len(df) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(long['Item'], minlength=len(df)), out=offsets[1:])
+    return {"items": items, "long": long, "offsets": offsets, "months": list(months)}
+
+
+def view_facts(view, rows=None):
+    """Long facts for the given item rows (all items when rows is None)."""
+    if rows is None:
+        return view["long"]
+    rows = np.asarray(rows, dtype=np.int64)
+    offsets = view["offsets"]
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    group_start = np.repeat(np.cumsum(counts) - counts, counts)
+    positions = np.repeat(starts, counts) + (np.arange(int(counts.sum())) - group_start)
+    return view["long"].iloc[positions]
+
+
+def monthly_totals(view, rows=None):
+    """Sales and Profit per month (every month present, oldest first)."""
+    return (
+        view_facts(view, rows)
+        .groupby('Month', observed=False)[['Sales', 'Profit']]
+        .sum()
+        .reset_index()
+    )
+
+
+def month_table(view, rows):
+    """Per-month "<Mon>-<YYYY> Total Sales/Profit" columns for the given rows."""
+    rows = np.asarray(rows, dtype=np.int64)
+    facts = view_facts(view, rows)
+    position = np.full(len(view["items"]), -1, dtype=np.int64)
+    position[rows] = np.arange(len(rows))
+
+    fact_pos = position[facts['Item'].to_numpy()]
+    month_codes = facts['Month'].cat.codes.to_numpy()
+    sales = np.zeros((len(rows), len(view["months"])))
+    profit = np.zeros((len(rows), len(view["months"])))
+    sales[fact_pos, month_codes] = facts['Sales'].to_numpy()
+    profit[fact_pos, month_codes] = facts['Profit'].to_numpy()
+
+    table = {}
+    for code, month in enumerate(view["months"]):
+        table[f"{month} Total Sales"] = sales[:, code]
+        table[f"{month} Total Profit"] = profit[:, code]
+    return pd.DataFrame(table)
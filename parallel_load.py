@@ -0,0 +1,70 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pyarrow as pa
+
+from reports import load_items
+
+# ============================
+# Parallel Workbook Loading
+# ============================
+# openpyxl parsing is CPU-bound and single-threaded, so loading several branch
+# workbooks one after another costs the sum of their parse times. Here each
+# workbook is parsed, derived and compacted in its own worker process and
+# shipped back as an Arrow IPC stream (one contiguous buffer per frame rather
+# than a pickle of every column object), so a cold start costs roughly the
+# slowest workbook.
+
+MAX_LOAD_WORKERS = int(os.environ.get("SALES_LOAD_WORKERS", "0")) or None
+# Workers are spawned, not forked: the pool is started from the threaded
+# Streamlit server (even from a reload thread), and a fork taken while another
+# thread holds a lock (say sales_store's sync lock) leaves the child stuck
+WORKER_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def frame_to_ipc(df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def frame_from_ipc(buffer):
+    # pandas metadata in the schema restores categoricals and string[pyarrow]
+    return pa.ipc.open_stream(buffer).read_all().to_pandas()
+
+
+def _load_worker(file_path, branch, months):
+    start = time.perf_counter()
+    df = load_items(file_path, branch, months)
+    parsed = time.perf_counter() - start
+    return frame_to_ipc(df), len(df), parsed
+
+
+def load_workbooks(jobs, workers=MAX_LOAD_WORKERS):
+    """Load {name: (file_path, branch, months)} concurrently.
+
+    Returns (frames, timings): frames maps name to the compact item frame for
+    every job that loaded; timings has one row per job with rows, worker parse
+    time, transfer size, wall time until the result arrived, and any error.
+    """
+    frames, timings = {}, []
+    if not jobs:
+        return frames, timings
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or min(len(jobs), os.cpu_count() or 1), mp_context=WORKER_CONTEXT) as pool:
+        futures = {name: pool.submit(_load_worker, *job) for name, job in jobs.items()}
+        for name, future in futures.items():
+            timing = {"name": name, "file": os.path.basename(jobs[name][0])}
+            try:
+                buffer, rows, parsed = future.result()
+                frames[name] = frame_from_ipc(buffer)
+                timing.update(rows=rows, parse_s=round(parsed, 3), transfer_kb=round(buffer.size / 1024, 1), error=None)
+            except Exception as e:
+                timing.update(rows=0, parse_s=None, transfer_kb=None, error=str(e))
+            timing["ready_s"] = round(time.perf_counter() - start, 3)
+            timings.append(timing)
+    return frames, timings
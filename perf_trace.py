@@ -0,0 +1,97 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# ============================
+# Per-rerun Stage Timing
+# ============================
+# Each dashboard rerun opens a trace, wraps its stages (load, derive, filter,
+# aggregate, chart, table) in `with stage(...)`, and closes the trace at the
+# end. Every stage records wall time and the change in process RSS. With no
+# open trace (reports CLI, worker processes, benchmarks) stage() does nothing.
+#
+# Set SALES_TRACE_LOG to a file path to append one JSON line per rerun.
+
+TRACE_LOG = os.environ.get("SALES_TRACE_LOG")
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+def rss_mb():
+    """Current resident set size of this process in MB (None if unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return None
+
+
+def _round(mb):
+    return None if mb is None else round(mb, 2)
+
+
+def start_trace(page, **context):
+    """Open a trace for this thread's rerun and return it."""
+    _local.trace = {
+        "page": page,
+        "started_at": time.time(),
+        "start": time.perf_counter(),
+        "rss_start_mb": _round(rss_mb()),
+        "stages": [],
+        "depth": 0,
+        "finished": False,
+        **context,
+    }
+    return _local.trace
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block as one stage of the open trace.
+
+    Stages may nest (e.g. a cache-miss "derive" inside "load"); nested stages
+    carry a depth > 0 and are already included in their parent's time.
+    """
+    trace = current_trace()
+    if trace is None:
+        yield
+        return
+    # Appended on entry so parents are listed before their nested stages
+    record = {"stage": name, "depth": trace["depth"], "seconds": None, "rss_delta_mb": None}
+    trace["stages"].append(record)
+    trace["depth"] += 1
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        rss_after = rss_mb()
+        trace["depth"] -= 1
+        record["seconds"] = round(time.perf_counter() - start, 6)
+        if rss_before is not None and rss_after is not None:
+            record["rss_delta_mb"] = _round(rss_after - rss_before)
+
+
+def finish_trace(trace=None, log_path=TRACE_LOG):
+    """Close a trace (this thread's by default), append it to log_path (if
+    set) and return the record; None if there was nothing left to close."""
+    trace = current_trace() if trace is None else trace
+    if trace is None or trace["finished"]:
+        return None
+    trace["finished"] = True
+    if current_trace() is trace:
+        _local.trace = None
+    record = {key: value for key, value in trace.items() if key not in ("start", "depth", "finished")}
+    record["total_seconds"] = round(time.perf_counter() - trace["start"], 6)
+    record["rss_end_mb"] = _round(rss_mb())
+    if log_path:
+        with _log_lock, open(log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+    return record
@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+
+from agg_cache import AggregateCache
+from branches import BASE_PERIOD, CURRENT_PERIOD, PERIODS
+from months import month_columns
+from sales_store import dataset_version, load_sales
+from totals import safe_ratio
+
+# ============================
+# Cross-period Variance
+# ============================
+# Compares one branch's items across two periods (e.g. Jul-Sep vs Oct). Item
+# codes from both periods are factorized into one integer key space, so the
+# join and the per-item sums are bincounts over integer keys rather than a
+# pandas merge on strings. Totals are also divided by the number of months in
+# each period, so a three-month period and a one-month period compare on a
+# per-month run rate.
+
+TOP_MOVERS = 5
+
+# Results per (branch, period pair, dataset versions); shared by every caller
+_variance_cache = AggregateCache()
+
+
+def _period_sums(df, months):
+    found = month_columns(df.columns)
+    missing = [month for month in months if month not in found]
+    if missing:
+        raise ValueError(f"Months not in data: {', '.join(missing)}")
+    sales = np.zeros(len(df))
+    profit = np.zeros(len(df))
+    for month in months:
+        sales_col, profit_col = found[month]
+        sales += np.nan_to_num(df[sales_col].to_numpy(dtype="float64", na_value=np.nan))
+        profit += np.nan_to_num(df[profit_col].to_numpy(dtype="float64", na_value=np.nan))
+    return sales, profit
+
+
+def _encode_codes(current_codes, base_codes):
+    # Factorize each side in its own dtype, then align only the (few) uniques
+    # as strings, so int and text exports of the same code still match
+    cur_keys, cur_uniques = pd.factorize(current_codes)
+    base_keys, base_uniques = pd.factorize(base_codes)
+    unique_keys, uniques = pd.factorize(np.concatenate([
+        np.asarray(cur_uniques).astype(str), np.asarray(base_uniques).astype(str),
+    ]))
+    return unique_keys[cur_keys], unique_keys[len(cur_uniques) + base_keys], uniques
+
+
+def _first_rows(keys, n_items):
+    # Row of each key's first occurrence, -1 where the key doesn't occur
+    first = np.full(n_items, -1, dtype=np.int64)
+    first[keys[::-1]] = np.arange(len(keys) - 1, -1, -1)
+    return first
+
+
+def _attribute(col, current_df, cur_first, base_df, base_first, default):
+    # Current period's value where the item was sold, else the base period's
+    values = pd.Series(default, index=range(len(cur_first)), dtype=object)
+    for df, first in ((base_df, base_first), (current_df, cur_first)):
+        if col in df.columns:
+            present = np.flatnonzero(first >= 0)
+            taken = df[col].take(first[present]).to_numpy(dtype=object)
+            values.iloc[present] = np.where(pd.isna(taken), values.iloc[present].to_numpy(), taken)
+    return values
+
+
+def compute_variance(base_df, base_months, current_df, current_months):
+    """Per-item sales / profit / GP% deltas and per-month run rates.
+
+    Repeated item codes within a period are summed. Status is "new" for items
+    only sold in the current period, "dropped" for items only in the base.
+    """
+    base_sales, base_profit = _period_sums(base_df, base_months)
+    cur_sales, cur_profit = _period_sums(current_df, current_months)
+    cur_keys, base_keys, uniques = _encode_codes(current_df['Item Code'], base_df['Item Code'])
+    n_items = len(uniques)
+
+    base_sales = np.bincount(base_keys, weights=base_sales, minlength=n_items)
+    base_profit = np.bincount(base_keys, weights=base_profit, minlength=n_items)
+    cur_sales = np.bincount(cur_keys, weights=cur_sales, minlength=n_items)
+    cur_profit = np.bincount(cur_keys, weights=cur_profit, minlength=n_items)
+    cur_first, base_first = _first_rows(cur_keys, n_items), _first_rows(base_keys, n_items)
+    in_base, in_current = base_first >= 0, cur_first >= 0
+
+    base_gp = (safe_ratio(base_profit, base_sales) * 100).round(2)
+    cur_gp = (safe_ratio(cur_profit, cur_sales) * 100).round(2)
+    base_rate = base_sales / len(base_months)
+    cur_rate = cur_sales / len(current_months)
+    return pd.DataFrame({
+        'Item Code': uniques,
+        'Items': _attribute('Items', current_df, cur_first, base_df, base_first, ''),
+        'Category': _attribute('Category', current_df, cur_first, base_df, base_first, 'Unknown'),
+        'Base Sales': base_sales,
+        'Base Profit': base_profit,
+        'Current Sales': cur_sales,
+        'Current Profit': cur_profit,
+        'Sales Delta': cur_sales - base_sales,
+        'Profit Delta': cur_profit - base_profit,
+        'Base GP%': base_gp,
+        'Current GP%': cur_gp,
+        'GP% Delta': cur_gp - base_gp,
+        'Base Run Rate': base_rate,
+        'Current Run Rate': cur_rate,
+        'Run Rate Delta': cur_rate - base_rate,
+        'Run Rate Change %': (safe_ratio(cur_rate - base_rate, base_rate) * 100).round(2),
+        'Status': np.select([in_base & in_current, in_current], ["continuing", "new"], "dropped"),
+    })
+
+
+def variance_totals(variance, base_months, current_months):
+    """Headline sales / profit / run-rate figures for a variance frame."""
+    base_sales, cur_sales = variance['Base Sales'].sum(), variance['Current Sales'].sum()
+    base_profit, cur_profit = variance['Base Profit'].sum(), variance['Current Profit'].sum()
+    base_rate, cur_rate = base_sales / len(base_months), cur_sales / len(current_months)
+    return {
+        'base_sales': base_sales,
+        'current_sales': cur_sales,
+        'base_gp': (base_profit / base_sales) if base_sales != 0 else 0,
+        'current_gp': (cur_profit / cur_sales) if cur_sales != 0 else 0,
+        'base_run_rate': base_rate,
+        'current_run_rate': cur_rate,
+        'run_rate_change': ((cur_rate - base_rate) / base_rate) if base_rate != 0 else 0,
+    }
+
+
+def top_movers(variance, n=TOP_MOVERS, by='Run Rate Delta'):
+    """The n items per category with the largest absolute change in `by`."""
+    ranked = variance.assign(_size=variance[by].abs()).sort_values(
+        ['Category', '_size'], ascending=[True, False], kind="stable",
+    )
+    return ranked.groupby('Category', sort=False).head(n).drop(columns='_size').reset_index(drop=True)
+
+
+# ============================
+# Branch Period Pairs
+# ============================
+def comparable_branches(base=BASE_PERIOD, current=CURRENT_PERIOD):
+    return [branch for branch, periods in PERIODS.items() if base in periods and current in periods]
+
+
+def branch_variance(branch, base=BASE_PERIOD, current=CURRENT_PERIOD):
+    """Variance for one branch between two of its PERIODS, cached per data version."""
+    base_spec, current_spec = PERIODS[branch][base], PERIODS[branch][current]
+    key = (
+        branch, base, current,
+        dataset_version(base_spec["file"], branch, base_spec["months"]),
+        dataset_version(current_spec["file"], branch, current_spec["months"]),
+    )
+
+    def compute():
+        return compute_variance(
+            load_sales(base_spec["file"], branch, base_spec["months"]), base_spec["months"],
+            load_sales(current_spec["file"], branch, current_spec["months"]), current_spec["months"],
+        )
+    return _variance_cache.get_or_compute(key, compute)
+
+
+def all_branches_variance(base=BASE_PERIOD, current=CURRENT_PERIOD):
+    """Per-item variance for every branch that has both periods, with a Branch column."""
+    frames = [branch_variance(branch, base, current).assign(Branch=branch) for branch in comparable_branches(base, current)]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def comparison_months(base=BASE_PERIOD, current=CURRENT_PERIOD):
+    """Month lists of the two periods (the same for every branch that has them)."""
+    branch = comparable_branches(base, current)[0]
+    return PERIODS[branch][base]["months"], PERIODS[branch][current]["months"]
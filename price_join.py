@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+# ============================
+# Price list <-> sales join
+# ============================
+# The price list is left-joined to the sales frame once per loaded pair of
+# files. Barcodes from both sides are factorized into one shared integer code
+# space, so the join itself is a sort + searchsorted over int64 arrays rather
+# than a hash of Python strings. Searches then only slice the result.
+
+
+def encode_keys(price_keys, sales_keys):
+    """Integer codes for both key columns drawn from one shared vocabulary."""
+    price_keys = pd.Series(price_keys).astype(str).to_numpy(dtype=object)
+    sales_keys = pd.Series(sales_keys).astype(str).to_numpy(dtype=object)
+    codes, uniques = pd.factorize(np.concatenate([price_keys, sales_keys]))
+    return codes[:len(price_keys)], codes[len(price_keys):], uniques
+
+
+def expand_ranges(starts, counts):
+    # Flattened [start, start + count) ranges, e.g. ([4, 9], [2, 1]) -> [4, 5, 9]
+    total = int(counts.sum())
+    group_start = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + (np.arange(total) - group_start)
+
+
+def build_price_sales_join(price_df, sales_df, price_key='Item Bar Code', sales_key='Item Code'):
+    """Materialize pd.merge(price_df, sales_df, how='left') once.
+
+    Returns a dict with the joined frame (price-list order, matching sales
+    rows in sales-file order), CSR offsets mapping each price-list row to its
+    joined rows, and the barcodes that found no partner on either side.
+    """
+    price_codes, sales_codes, uniques = encode_keys(price_df[price_key], sales_df[sales_key])
+
+    order = np.argsort(sales_codes, kind="stable")
+    sorted_codes = sales_codes[order]
+    starts = np.searchsorted(sorted_codes, price_codes, side="left")
+    counts = np.searchsorted(sorted_codes, price_codes, side="right") - starts
+
+    # Unmatched price rows still produce one joined row, like a left join
+    out_counts = np.maximum(counts, 1)
+    matched = np.repeat(counts > 0, out_counts)
+    positions = expand_ranges(np.where(counts > 0, starts, 0), out_counts)
+    sales_rows = np.full(len(positions), -1, dtype=np.int64)
+    sales_rows[matched] = order[positions[matched]]
+    price_rows = np.repeat(np.arange(len(price_df)), out_counts)
+
+    left = price_df.iloc[price_rows].reset_index(drop=True)
+    right = sales_df.reset_index(drop=True).reindex(sales_rows).reset_index(drop=True)
+    overlap = left.columns.intersection(right.columns)
+    if len(overlap):
+        # Same suffixes pd.merge would apply
+        left = left.rename(columns={col: f"{col}_x" for col in overlap})
+        right = right.rename(columns={col: f"{col}_y" for col in overlap})
+
+    offsets = np.zeros(len(price_df) + 1, dtype=np.int64)
+    np.cumsum(out_counts, out=offsets[1:])
+
+    sold = np.zeros(len(uniques), dtype=bool)
+    sold[sales_codes] = True
+    listed = np.zeros(len(uniques), dtype=bool)
+    listed[price_codes] = True
+
+    return {
+        "joined": pd.concat([left, right], axis=1),
+        "offsets": offsets,
+        "unmatched_price": price_df[~sold[price_codes]].reset_index(drop=True),
+        "unmatched_sales": sales_df[~listed[sales_codes]].reset_index(drop=True),
+    }
+
+
+def joined_rows(join, price_rows):
+    """Positions in join["joined"] for the given price-list row positions."""
+    price_rows = np.asarray(price_rows, dtype=np.int64)
+    offsets = join["offsets"]
+    starts = offsets[price_rows]
+    return expand_ranges(starts, offsets[price_rows + 1] - starts)
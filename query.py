@@ -0,0 +1,87 @@
+import os
+
+import streamlit as st
+
+from branches import BRANCHES
+from debug_panel import start_rerun_trace, timing_panel
+from perf_trace import stage
+from sales_store import dataset_version
+from sql_engine import SalesSQL
+from table_view import paginated_table
+
+# ============================
+# Page Config
+# ============================
+st.set_page_config(page_title="Ad-hoc Sales Query", layout="wide")
+st.title("🧮 Ad-hoc Sales Query")
+start_rerun_trace("query")
+
+PRICE_FILE = "price list(1).xlsx"
+EXAMPLE_QUERY = """SELECT Branch, Category,
+       sum("Total Sales") AS "Total Sales",
+       sum("Total Profit") AS "Total Profit",
+       count(*) FILTER (WHERE "GP%" < 0) AS "Negative GP Items"
+FROM sales
+GROUP BY ALL
+ORDER BY "Total Sales" DESC"""
+
+
+# ============================
+# Engine
+# ============================
+# One in-process DuckDB database for all sessions; views scan the Parquet
+# files on every query, so nothing is held in memory between queries. Once
+# the views exist, file access is locked to the store and cache directories
+# and only single SELECTs are run, so one session can't touch the host's
+# files or replace the views other sessions use. The engine is keyed on the
+# sources' dataset versions: new data builds (and locks) a new engine rather
+# than changing the locked one, and the old engine is dropped.
+def source_version(file_path, branch=None, months=None):
+    try:
+        return dataset_version(file_path, branch, months)
+    except OSError:
+        return None  # Missing workbook; registering it reports the error
+
+
+def source_versions():
+    versions = tuple(source_version(info["file"], branch, info.get("months")) for branch, info in BRANCHES.items())
+    return versions + (source_version(PRICE_FILE),)
+
+
+@st.cache_resource(max_entries=1)
+def sql_engine(versions):
+    engine = SalesSQL()
+    engine.register_branches()
+    if os.path.exists(PRICE_FILE):
+        engine.register_price_list(PRICE_FILE)
+    engine.restrict()
+    return engine
+
+
+try:
+    engine = sql_engine(source_versions())
+except Exception as e:
+    st.error(f"Error loading files: {e}")
+    st.stop()
+
+with st.sidebar.expander("Tables", expanded=True):
+    for name, description in engine.tables.items():
+        st.markdown(f"`{name}` — {description}")
+
+sql = st.text_area("SQL (DuckDB dialect)", value=EXAMPLE_QUERY, height=200)
+# The last result is kept per session, so paging through it doesn't rerun the query
+if st.button("Run query"):
+    try:
+        with stage("query"):
+            st.session_state["query_result"] = engine.select(sql)
+    except Exception as e:
+        st.error(f"Query failed: {e}")
+        st.session_state.pop("query_result", None)
+
+if "query_result" in st.session_state:
+    result = st.session_state["query_result"]
+    st.caption(f"{len(result):,} rows")
+    with stage("table"):
+        paginated_table(result, key="query")
+
+timing_panel()
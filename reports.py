@@ -0,0 +1,189 @@
+"""Headless sales reports: the dashboard numbers without Streamlit or plotly.
+
+Computes, per workbook, the Key Insights metrics, the negative-GP% item
+count per category and the category GP% summary, using the same load /
+derive / filter steps as the dashboards. Workbooks are processed in
+parallel, one per worker process.
+
+Usage:
+
+    python reports.py                          # every branch, CSV into reports/
+    python reports.py --format parquet --out /srv/reports/2025-10-16
+    python reports.py --job Hilal --job "Safa Jul-Sep" --gp "<5%"
+    python reports.py --exclude-category "FMCG NON FOOD" --workers 2
+    python reports.py --engine duckdb          # same tables, computed in SQL
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from branches import BRANCHES, GP_OPTIONS, derive_totals
+from compact import compact_frame
+from filter_index import build_filter_index, select_rows
+from perf_trace import stage
+from sales_store import load_sales
+
+REPORT_DIR = os.environ.get("SALES_REPORT_DIR", "reports")
+
+# Multi-month workbooks reported alongside the per-branch October exports
+PERIOD_REPORTS = {
+    "Safa Jul-Sep": {
+        "file": "july to sep safa2025.Xlsx",
+        "branch": "Safa",
+        "months": ["Jul-2025", "Aug-2025", "Sep-2025"],
+    },
+}
+
+
+def report_jobs():
+    """{job name: {"file", "branch", "months"}} for every known workbook."""
+    jobs = {
+        name: {"file": info["file"], "branch": name, "months": info.get("months")}
+        for name, info in BRANCHES.items()
+    }
+    jobs.update(PERIOD_REPORTS)
+    return jobs
+
+
+# ============================
+# Load / Filter
+# ============================
+def load_items(file_path, branch=None, months=None):
+    """Item frame with Category fill, totals, GP% and GP band, compacted."""
+    with stage("read"):
+        df = load_sales(file_path, branch, months)
+    with stage("derive"):
+        return compact_frame(derive_totals(df))
+
+
+def filter_items(df, selected_category='All', exclude_categories=(), selected_gp='All', index=None):
+    """Rows matching the sidebar filters; pass a cached filter index to reuse it."""
+    if index is None:
+        index = build_filter_index(df)
+    return df.iloc[select_rows(index, selected_category, exclude_categories, selected_gp)]
+
+
+# ============================
+# Report Computations
+# ============================
+def key_insights(filtered_df):
+    total_sales = filtered_df['Total Sales'].sum()
+    total_profit = filtered_df['Total Profit'].sum()
+    return {
+        'total_sales': total_sales,
+        'total_profit': total_profit,
+        'avg_gp': filtered_df['GP%'].mean().round(2) if not filtered_df.empty else 0,
+        'overall_gp': (total_profit / total_sales) if total_sales != 0 else 0,
+    }
+
+
+def negative_gp_by_category(filtered_df):
+    negative_items = filtered_df[filtered_df['GP%'] < 0]
+    return (
+        negative_items.groupby('Category', observed=True)
+        .size()
+        .reset_index(name='Negative Item Count')
+        .sort_values(by='Negative Item Count', ascending=False)
+    )
+
+
+def category_gp_summary(filtered_df):
+    category_summary = filtered_df.groupby('Category', observed=True).agg({'Total Sales':'sum','Total Profit':'sum'}).reset_index()
+    category_summary['GP'] = category_summary['Total Profit'] / category_summary['Total Sales'].replace(0,1)
+    return category_summary
+
+
+def build_report(job, selected_category='All', exclude_categories=(), selected_gp='All', engine="pandas"):
+    """Report tables for one workbook job."""
+    if engine == "duckdb":
+        # Optional dependency; only needed for the SQL engine
+        from sql_engine import sql_report
+        return sql_report(job, selected_category, exclude_categories, selected_gp)
+    df = load_items(job["file"], job.get("branch"), job.get("months"))
+    filtered_df = filter_items(df, selected_category, exclude_categories, selected_gp)
+    return {
+        "key_insights": pd.DataFrame([key_insights(filtered_df)]),
+        "negative_gp_by_category": negative_gp_by_category(filtered_df),
+        "category_summary": category_gp_summary(filtered_df),
+    }
+
+
+# ============================
+# Batch Runner
+# ============================
+def _slug(name):
+    return name.lower().replace(" ", "_")
+
+
+def write_table(df, path_stem, fmt):
+    path = f"{path_stem}.{fmt}"
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def run_job(name, job, out_dir, fmt, filters, engine="pandas"):
+    # Runs in a worker process; writes its own tables and returns the headline row
+    start = time.perf_counter()
+    tables = build_report(job, *filters, engine=engine)
+    for table_name, table in tables.items():
+        write_table(table, os.path.join(out_dir, f"{_slug(name)}_{table_name}"), fmt)
+    return tables["key_insights"].assign(Report=name, Seconds=round(time.perf_counter() - start, 2))
+
+
+def run_reports(names=None, out_dir=REPORT_DIR, fmt="csv", filters=('All', (), 'All'), workers=None, engine="pandas"):
+    """Build reports for the named jobs (all by default) in a process pool.
+
+    Returns the combined key-insights table, also written as key_insights.<fmt>.
+    """
+    jobs = report_jobs()
+    names = list(jobs) if not names else names
+    unknown = [name for name in names if name not in jobs]
+    if unknown:
+        raise ValueError(f"Unknown report job(s): {', '.join(unknown)}")
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Spawned rather than forked, so no lock held by another thread is inherited
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers or min(len(names), os.cpu_count() or 1), mp_context=context) as pool:
+        futures = {name: pool.submit(run_job, name, jobs[name], out_dir, fmt, filters, engine) for name in names}
+        rows = [futures[name].result() for name in names]
+
+    combined = pd.concat(rows, ignore_index=True)
+    combined = combined[['Report'] + [col for col in combined.columns if col != 'Report']]
+    write_table(combined, os.path.join(out_dir, "key_insights"), fmt)
+    return combined
+
+
+# ============================
+# CLI
+# ============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--job", action="append", dest="jobs", choices=list(report_jobs()),
+                        help="workbook to report on (repeatable; default: all)")
+    parser.add_argument("--out", default=REPORT_DIR, help="output directory")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per job, up to CPU count)")
+    parser.add_argument("--category", default='All', help="same as the 'Select Category' filter")
+    parser.add_argument("--exclude-category", action="append", default=[], help="repeatable")
+    parser.add_argument("--gp", choices=GP_OPTIONS, default='All', help="same as the 'Select GP%% Range' filter")
+    parser.add_argument("--engine", choices=["pandas", "duckdb"], default="pandas",
+                        help="compute in pandas or push the filters and aggregates down to DuckDB SQL")
+    args = parser.parse_args(argv)
+
+    combined = run_reports(
+        args.jobs, args.out, args.format,
+        (args.category, tuple(args.exclude_category), args.gp), args.workers, args.engine,
+    )
+    print(combined.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Pre-aggregated category rollup cube for the summary metrics and charts.
+
+A cube holds, for one dataset (branch workbook or stored months), three
+small tables:
+
+  cells   Category x GP Band x Month -> Sales, Profit, Items
+  bands   Category x GP Band -> Total Sales, Total Profit, GP% Sum, Items,
+          Negative Items
+  hist    Category x GP% Bin (+ its GP Band) -> Items, Sales, Profit; the
+          mergeable GP% histogram (see gp_sketch.py)
+
+GP Band is the item's band over all of the dataset's months, exactly as the
+"Select GP% Range" filter sees it, so every sidebar combination is a slice
+of the cube. Key Insights, the negative-GP% counts, the category summary and
+the monthly totals are then sums over a few hundred rows; only the item
+table still reads row-level data.
+
+Cubes are persisted as Parquet next to the data they summarize (the branch
+directory of the sales store, or the sidecar cache for workbooks) and keyed
+by sales_store.dataset_version, so a changed source gets a new cube and
+the old one is removed.
+`sales_store.py ingest` builds a branch's cubes ahead of time; to rebuild
+them by hand:
+
+    python rollup_cube.py refresh "Shams Salem"
+"""
+import argparse
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from branches import BRANCHES, PERIODS, derive_totals, summarize_branch
+from data_cache import CACHE_DIR, write_atomic
+from gp_sketch import gp_histogram
+from months import month_key, to_long
+from sales_store import branch_dir, dataset_version, load_sales, stored_months, sync_source
+
+TABLES = ("cells", "bands", "hist")
+
+
+# ============================
+# Build
+# ============================
+def build_cube(df):
+    """Cube for an item frame that has been through derive_totals."""
+    category = df['Category'].astype(str).to_numpy()
+    band = df['GP Band'].astype(str).to_numpy()
+
+    long = to_long(df)
+    items = long['Item'].to_numpy()
+    cells = (
+        pd.DataFrame({
+            'Category': category[items],
+            'GP Band': band[items],
+            'Month': long['Month'],
+            'Sales': long['Sales'],
+            'Profit': long['Profit'],
+        })
+        .groupby(['Category', 'GP Band', 'Month'], observed=True)
+        .agg(Sales=('Sales', 'sum'), Profit=('Profit', 'sum'), Items=('Sales', 'size'))
+        .reset_index()
+    )
+    cells['Month'] = cells['Month'].astype(str)
+
+    bands = summarize_branch(df.assign(Category=category))
+    negative = (
+        pd.DataFrame({'Category': category, 'GP Band': band, 'Negative Items': (df['GP%'] < 0).to_numpy()})
+        .groupby(['Category', 'GP Band'])['Negative Items']
+        .sum()
+        .reset_index()
+    )
+    bands = bands.merge(negative, on=['Category', 'GP Band'], how='left')
+    return {"cells": cells, "bands": bands, "hist": gp_histogram(df.assign(Category=category))}
+
+
+# ============================
+# Persistence
+# ============================
+def _normalize_months(months):
+    return None if months is None else tuple(sorted(months, key=month_key))
+
+
+def _digest(value):
+    return hashlib.sha1(repr(value).encode("utf-8")).hexdigest()[:16]
+
+
+def cube_path(file_path, branch=None, months=None):
+    """Path prefix for the cube of this dataset version.
+
+    The prefix is "<dataset>-<version>": the first digest names the dataset
+    (store or workbook, branch, source file, months) and stays put when its
+    data changes, so older versions of a cube can be found and removed.
+    """
+    months = _normalize_months(months)
+    version = dataset_version(file_path, branch, months)
+    source = None if file_path is None else os.path.abspath(file_path)
+    dataset = _digest((version[0], branch, source, months))
+    directory = os.path.join(branch_dir(branch), "cubes") if version[0] == "store" else os.path.join(CACHE_DIR, "cubes")
+    return os.path.join(directory, f"{dataset}-{_digest(version + (months,))}")
+
+
+def _remove_stale(prefix):
+    # Other versions of exactly this dataset: "<dataset>-<16 hex digits>.<table>.parquet"
+    directory, name = os.path.split(prefix)
+    dataset = name.split("-")[0] + "-"
+    names = {f"{table}.parquet" for table in TABLES}
+    for entry in os.listdir(directory):
+        stem, _, rest = entry.partition(".")
+        if entry.startswith(dataset) and len(stem) == len(name) and rest in names and stem != name:
+            os.remove(os.path.join(directory, entry))
+
+
+def load_cube(file_path, branch=None, months=None):
+    """Persisted cube for the dataset, built (and written) on first use.
+
+    Writing a new version removes the dataset's superseded cube files.
+    """
+    months = _normalize_months(months)
+    # Re-ingest a replaced workbook first, so the cube path names what is loaded
+    sync_source(file_path, branch)
+    prefix = cube_path(file_path, branch, months)
+    if all(os.path.exists(f"{prefix}.{table}.parquet") for table in TABLES):
+        return {table: pd.read_parquet(f"{prefix}.{table}.parquet") for table in TABLES}
+
+    cube = build_cube(derive_totals(load_sales(file_path, branch, months)))
+    os.makedirs(os.path.dirname(prefix), exist_ok=True)
+    for table in TABLES:
+        write_atomic(f"{prefix}.{table}.parquet", lambda tmp_path: cube[table].to_parquet(tmp_path, index=False))
+    _remove_stale(prefix)
+    return cube
+
+
+def branch_month_sets(branch):
+    """Month sets the dashboards read for a branch, plus all stored months."""
+    month_sets = [None]
+    if branch in BRANCHES:
+        month_sets.append(BRANCHES[branch].get("months"))
+    month_sets += [period["months"] for period in PERIODS.get(branch, {}).values()]
+    return list(dict.fromkeys(_normalize_months(months) for months in month_sets))
+
+
+def refresh_cubes(branch):
+    """Build the cubes for every stored month set of an ingested branch.
+
+    Returns {months: path prefix}; month sets the store can't serve yet are
+    skipped.
+    """
+    available = set(stored_months(branch))
+    refreshed = {}
+    for months in branch_month_sets(branch):
+        if not available or (months is not None and not set(months) <= available):
+            continue
+        load_cube(None, branch, months)
+        refreshed[months] = cube_path(None, branch, months)
+    return refreshed
+
+
+# ============================
+# Queries
+# ============================
+def slice_cube(cube, selected_category='All', exclude_categories=(), selected_gp='All'):
+    """Cube restricted to the sidebar filters."""
+    sliced = {}
+    for table, frame in cube.items():
+        keep = np.ones(len(frame), dtype=bool)
+        if selected_category != 'All':
+            keep &= (frame['Category'] == selected_category).to_numpy()
+        if exclude_categories:
+            keep &= ~frame['Category'].isin(exclude_categories).to_numpy()
+        if selected_gp != 'All':
+            keep &= (frame['GP Band'] == selected_gp).to_numpy()
+        sliced[table] = frame[keep]
+    return sliced
+
+
+def cube_insights(cube):
+    """Key Insights numbers (see reports.key_insights)."""
+    bands = cube["bands"]
+    total_sales = bands['Total Sales'].sum()
+    total_profit = bands['Total Profit'].sum()
+    items = bands['Items'].sum()
+    return {
+        'total_sales': total_sales,
+        'total_profit': total_profit,
+        'avg_gp': round(bands['GP% Sum'].sum() / items, 2) if items else 0,
+        'overall_gp': (total_profit / total_sales) if total_sales != 0 else 0,
+    }
+
+
+def cube_negative_gp(cube):
+    """Negative-GP% item count per category (see reports.negative_gp_by_category)."""
+    counts = cube["bands"].groupby('Category')['Negative Items'].sum()
+    counts = counts[counts > 0]
+    return (
+        counts.rename('Negative Item Count')
+        .reset_index()
+        .sort_values(by='Negative Item Count', ascending=False)
+    )
+
+
+def cube_category_summary(cube):
+    """Sales, profit and GP per category (see reports.category_gp_summary)."""
+    category_summary = cube["bands"].groupby('Category', as_index=False)[['Total Sales', 'Total Profit']].sum()
+    category_summary['GP'] = category_summary['Total Profit'] / category_summary['Total Sales'].replace(0,1)
+    return category_summary
+
+
+def cube_monthly(cube, months=None):
+    """Sales and Profit per month, oldest first (see months.monthly_totals).
+
+    Pass the dataset's months to list months with no activity in the slice
+    as zero.
+    """
+    monthly = cube["cells"].groupby('Month')[['Sales', 'Profit']].sum()
+    months = sorted(set(monthly.index) | set(months or ()), key=month_key)
+    return monthly.reindex(months, fill_value=0).rename_axis('Month').reset_index()
+
+
+# ============================
+# CLI
+# ============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    refresh = commands.add_parser("refresh", help="build the cubes for an ingested branch")
+    refresh.add_argument("branches", nargs="+")
+    args = parser.parse_args(argv)
+
+    for branch in args.branches:
+        for months, prefix in refresh_cubes(branch).items():
+            label = "all months" if months is None else ", ".join(months)
+            print(f"{branch:<15} {label:<30} {prefix}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""Append-only, per-branch / per-month store for sales exports.
+
+Each export workbook carries one `<Mon>-<YYYY> Total Sales` and
+`<Mon>-<YYYY> Total Profit` pair per month. Ingesting an export writes one
+Parquet partition per month under STORE_DIR/<branch>/, but only for months
+that are new or whose content changed since the last ingest, so adding a
+day to October rewrites October alone and never re-parses July to September.
+
+Usage:
+
+    python sales_store.py ingest "Shams Salem" "shams july to oct 16 sales(1).Xlsx"
+    python sales_store.py status "Shams Salem"
+
+Once a branch has been ingested, the dashboards read the months they need
+from the store instead of the workbook. Ingest also refreshes the branch's
+rollup cubes (see rollup_cube.py). A workbook that was ingested and is then
+replaced in place is re-ingested the next time its dataset is loaded (see
+sync_source); dataset_version only notices the change.
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from data_cache import read_excel_cached, source_fingerprint, write_atomic
+from months import MONTH_COL_RE, month_columns, month_key
+
+STORE_DIR = os.environ.get("SALES_STORE_DIR", "sales_store")
+ITEM_COLS = ['Item Code', 'Items', 'Category']
+# Exports end with a "Grand Total" row in the Item Code column
+TOTAL_ROW_RE = r"^\s*(grand\s+)?total\s*$"
+# Part of every dataset version; bump when load_sales' output changes so
+# cubes, shared frames and cached results built from the old output go stale
+LOAD_REVISION = 3
+
+
+# ============================
+# Layout helpers
+# ============================
+def branch_dir(branch):
+    return os.path.join(STORE_DIR, branch.lower().replace(" ", "_"))
+
+
+def read_manifest(branch):
+    try:
+        with open(os.path.join(branch_dir(branch), "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(branch, manifest):
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    write_atomic(os.path.join(branch_dir(branch), "manifest.json"), write)
+
+
+def stored_months(branch):
+    return sorted(read_manifest(branch), key=month_key)
+
+
+def read_sources(branch):
+    """{absolute workbook path: size / mtime_ns when it was last ingested}."""
+    try:
+        with open(os.path.join(branch_dir(branch), "sources.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _record_source(branch, fingerprint):
+    sources = read_sources(branch)
+    sources[fingerprint["path"]] = {"size": fingerprint["size"], "mtime_ns": fingerprint["mtime_ns"]}
+
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(sources, f, indent=2, sort_keys=True)
+    write_atomic(os.path.join(branch_dir(branch), "sources.json"), write)
+
+
+def drop_total_rows(df):
+    """df without the export's total rows, which aren't items."""
+    if 'Item Code' not in df.columns:
+        return df
+    total = df['Item Code'].astype(str).str.match(TOTAL_ROW_RE, case=False).to_numpy()
+    return df[~total].reset_index(drop=True) if total.any() else df
+
+
+# ============================
+# Ingestion
+# ============================
+def _month_partition(df, sales_col, profit_col):
+    part = df[[col for col in ITEM_COLS if col in df.columns]].copy()
+    part['Item Code'] = part['Item Code'].astype(str)
+    part['Total Sales'] = df[sales_col].fillna(0).astype('float64')
+    part['Total Profit'] = df[profit_col].fillna(0).astype('float64')
+    return part.reset_index(drop=True)
+
+
+def _partition_hash(part):
+    return hashlib.sha1(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def ingest_frame(branch, df, source="<frame>"):
+    """Store every new or changed month of df; returns {month: status}."""
+    manifest = read_manifest(branch)
+    os.makedirs(branch_dir(branch), exist_ok=True)
+    df = drop_total_rows(df)
+
+    statuses = {}
+    for month, (sales_col, profit_col) in month_columns(df.columns).items():
+        part = _month_partition(df, sales_col, profit_col)
+        digest = _partition_hash(part)
+        previous = manifest.get(month)
+        if previous is not None and previous["sha1"] == digest:
+            statuses[month] = "unchanged"
+            continue
+
+        path = os.path.join(branch_dir(branch), f"{month}.parquet")
+        write_atomic(path, lambda tmp_path: part.to_parquet(tmp_path, index=False))
+        manifest[month] = {
+            "sha1": digest,
+            "rows": len(part),
+            "source": os.path.basename(source),
+            "ingested_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        statuses[month] = "added" if previous is None else "updated"
+
+    _write_manifest(branch, manifest)
+    return statuses
+
+
+def ingest_workbook(branch, file_path):
+    fingerprint = source_fingerprint(file_path)
+    statuses = ingest_frame(branch, read_excel_cached(file_path), source=file_path)
+    _record_source(branch, fingerprint)
+    return statuses
+
+
+_sync_lock = threading.Lock()
+
+
+def _ingested_before(branch, file_path, fingerprint):
+    # True when file_path was ingested into the store and has changed since
+    recorded = read_sources(branch).get(fingerprint["path"])
+    if recorded is not None:
+        return (recorded["size"], recorded["mtime_ns"]) != (fingerprint["size"], fingerprint["mtime_ns"])
+    # Stores ingested before sources.json: go by the months this file supplied
+    supplied = [
+        info["ingested_at"] for info in read_manifest(branch).values()
+        if info.get("source") == os.path.basename(file_path)
+    ]
+    if not supplied:
+        return False
+    modified = datetime.fromtimestamp(fingerprint["mtime_ns"] / 1e9, timezone.utc)
+    return modified > datetime.fromisoformat(max(supplied))
+
+
+def sync_source(file_path, branch):
+    """Re-ingest a workbook that changed since it was ingested into the branch's store.
+
+    So a workbook replaced in place reaches the store (only its changed
+    months are rewritten). Workbooks never ingested are left alone. Returns
+    ingest_workbook's statuses, or None when nothing was ingested.
+    """
+    if file_path is None or branch is None or not read_manifest(branch):
+        return None
+    with _sync_lock:
+        try:
+            fingerprint = source_fingerprint(file_path)
+        except OSError:
+            return None
+        if not _ingested_before(branch, file_path, fingerprint):
+            return None
+        return ingest_workbook(branch, file_path)
+
+
+# ============================
+# Reading
+# ============================
+def read_branch(branch, months=None):
+    """Wide frame in the export layout (Item Code, Items, Category, month pairs).
+
+    Only the requested months are read, so load time depends on the months a
+    dashboard shows rather than on how much history the store holds.
+    """
+    months = stored_months(branch) if months is None else sorted(months, key=month_key)
+    wide = None
+    for month in months:
+        part = pd.read_parquet(os.path.join(branch_dir(branch), f"{month}.parquet"))
+        part = part.rename(columns={
+            'Total Sales': f"{month} Total Sales",
+            'Total Profit': f"{month} Total Profit",
+        })
+        # Exports can repeat an item code; number the repeats so they line up
+        # one-to-one across months instead of multiplying in the merge
+        part['_repeat'] = part.groupby('Item Code', sort=False).cumcount()
+        if wide is None:
+            wide = part
+            continue
+        attrs = [col for col in ITEM_COLS[1:] if col in part.columns]
+        wide = wide.assign(_order=range(len(wide)))
+        part = part.assign(_order_new=range(len(wide), len(wide) + len(part)))
+        wide = wide.merge(part, on=['Item Code', '_repeat'], how='outer', suffixes=("", " (new)"))
+        # Keep existing items in place and append items first seen this month
+        order = wide.pop('_order').fillna(wide.pop('_order_new'))
+        wide = wide.iloc[order.argsort(kind="stable")].reset_index(drop=True)
+        for col in attrs:
+            # Prefer the most recent month's item name and category
+            if f"{col} (new)" in wide.columns:
+                wide[col] = wide.pop(f"{col} (new)").combine_first(wide[col])
+
+    if wide is None:
+        return pd.DataFrame(columns=ITEM_COLS)
+    value_cols = [col for col in wide.columns if MONTH_COL_RE.match(col)]
+    wide[value_cols] = wide[value_cols].fillna(0)
+    # Multi-month exports list every item in every month, with zeros where it
+    # had no activity; items with no facts in the requested months are dropped
+    active = (wide[value_cols].to_numpy() != 0).any(axis=1)
+    wide = wide[active]
+    return wide[[col for col in ITEM_COLS if col in wide.columns] + value_cols].reset_index(drop=True)
+
+
+def covered_months(branch, months, file_path=None):
+    """Months to read from the store, or None when the store can't serve them all.
+
+    With a file_path, every month must also have been ingested from that
+    workbook; another export of the same months (say a history file that
+    also covers October) is not a stand-in for it.
+    """
+    if branch is None:
+        return None
+    manifest = read_manifest(branch)
+    available = sorted(manifest, key=month_key)
+    if not available or (months is not None and not set(months) <= set(available)):
+        return None
+    covered = available if months is None else sorted(months, key=month_key)
+    if file_path is not None and any(manifest[month].get("source") != os.path.basename(file_path) for month in covered):
+        return None
+    return covered
+
+
+def load_sales(file_path, branch=None, months=None):
+    """Read a branch from the store when it holds every requested month as
+    ingested from file_path, otherwise fall back to the export workbook.
+
+    A replaced workbook is re-ingested first (see sync_source), so this
+    belongs in a build, never in a version check.
+    """
+    sync_source(file_path, branch)
+    covered = covered_months(branch, months, file_path)
+    if covered is not None:
+        # Months ingested before total rows were dropped may still hold one
+        return drop_total_rows(read_branch(branch, covered))
+    return drop_total_rows(read_excel_cached(file_path))
+
+
+def dataset_version(file_path, branch=None, months=None):
+    """Hashable token that changes whenever load_sales would return new data.
+
+    Read-only (stat calls and the manifest), so it is cheap enough for every
+    rerun. A stored dataset's token includes its workbook's size and mtime:
+    replacing the workbook changes the token, and the reload's load_sales
+    re-ingests it.
+    """
+    covered = covered_months(branch, months, file_path)
+    if covered is not None:
+        manifest = read_manifest(branch)
+        source = ()
+        if file_path is not None and os.path.exists(file_path):
+            fingerprint = source_fingerprint(file_path)
+            source = (fingerprint["size"], fingerprint["mtime_ns"])
+        return ("store", LOAD_REVISION, branch) + source + tuple(manifest[month]["sha1"] for month in covered)
+    fingerprint = source_fingerprint(file_path)
+    return ("file", LOAD_REVISION, fingerprint["path"], fingerprint["size"], fingerprint["mtime_ns"])
+
+
+# ============================
+# CLI
+# ============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="ingest one or more export workbooks")
+    ingest.add_argument("branch")
+    ingest.add_argument("files", nargs="+")
+
+    status = commands.add_parser("status", help="list stored months for a branch")
+    status.add_argument("branch")
+
+    args = parser.parse_args(argv)
+    if args.command == "ingest":
+        # rollup_cube reads through this module, so it is imported here
+        from rollup_cube import refresh_cubes
+
+        for file_path in args.files:
+            for month, state in ingest_workbook(args.branch, file_path).items():
+                print(f"{args.branch:<15} {month:<9} {state:<10} {os.path.basename(file_path)}")
+        refresh_cubes(args.branch)
+    else:
+        for month, info in sorted(read_manifest(args.branch).items(), key=lambda item: month_key(item[0])):
+            print(f"{month:<9} {info['rows']:>7} rows  {info['source']}  {info['ingested_at']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# ============================
+# Item search index
+# ============================
+# Case-insensitive substring search over item names and barcodes without
+# scanning the whole price list. Every value is split into overlapping
+# trigrams; a query is answered by intersecting the posting lists of its own
+# trigrams and confirming the few remaining candidates with a plain `in`.
+# Bigrams are indexed as well so that two-character queries are exact
+# lookups; only single characters fall back to a scan.
+
+NGRAM = 3
+MIN_GRAM = 2
+
+
+def _normalize(values):
+    return pd.Series(values, dtype="object").fillna("").astype(str).str.lower().tolist()
+
+
+def _grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _build_postings(texts):
+    postings = defaultdict(list)
+    for pos, text in enumerate(texts):
+        for gram in _grams(text, MIN_GRAM) | _grams(text, NGRAM):
+            postings[gram].append(pos)
+    # Positions are appended in row order, so every posting list is sorted
+    return {gram: np.asarray(rows, dtype=np.int32) for gram, rows in postings.items()}
+
+
+def build_field_index(values):
+    texts = _normalize(values)
+    return {
+        "texts": np.asarray(texts, dtype=object),
+        # Arrow-backed copy for the short-query fallback scan
+        "arrow_texts": pa.array(texts, type=pa.string()),
+        "postings": _build_postings(texts),
+    }
+
+
+def search_field(field, query):
+    """Row positions (sorted) whose value contains query, ignoring case."""
+    query = query.lower()
+    texts = field["texts"]
+    if len(query) < MIN_GRAM:
+        # Too short for the index; fall back to one scan in Arrow
+        matches = pc.match_substring(field["arrow_texts"], query)
+        return np.flatnonzero(matches.to_numpy(zero_copy_only=False)).astype(np.int32)
+
+    grams = _grams(query, min(len(query), NGRAM))
+    lists = []
+    for gram in grams:
+        rows = field["postings"].get(gram)
+        if rows is None:
+            return np.empty(0, dtype=np.int32)
+        lists.append(rows)
+
+    lists.sort(key=len)
+    candidates = lists[0]
+    for rows in lists[1:]:
+        candidates = np.intersect1d(candidates, rows, assume_unique=True)
+        if len(candidates) == 0:
+            return candidates
+    if len(query) <= NGRAM:
+        return candidates
+    return candidates[[query in texts[pos] for pos in candidates]] if len(candidates) else candidates
+
+
+def build_search_index(price_df):
+    return {
+        "name": build_field_index(price_df['Item Name']),
+        "barcode": build_field_index(price_df['Item Bar Code']),
+    }
+
+
+def search_items(index, item_search="", barcode_search=""):
+    """Price-list row positions matching both searches (empty search = no constraint)."""
+    result = None
+    for field, query in (("name", item_search), ("barcode", barcode_search)):
+        if not query:
+            continue
+        rows = search_field(index[field], query)
+        result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+    return result
+
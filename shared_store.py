@@ -0,0 +1,103 @@
+import fcntl
+import hashlib
+import os
+
+import pyarrow as pa
+
+from data_cache import CACHE_DIR, write_atomic
+from reports import load_items
+from sales_store import dataset_version, sync_source
+
+# ============================
+# Shared-memory dataset store
+# ============================
+# Loaded frames are published once as uncompressed Arrow IPC files, in
+# /dev/shm when it exists, and every session and every dashboard process
+# attaches to them through a read-only memory map. Numeric columns come back
+# as views of the mapped pages, so N processes share one physical copy in the
+# page cache instead of N parsed copies, and a cache hit is an mmap instead of
+# a pickle round trip through st.cache_data.
+#
+# Files are keyed by dataset name and version (see sales_store.dataset_version);
+# publishing a new version unlinks the old one, which stays readable by
+# processes that still have it mapped.
+
+SHARED_DIR = os.environ.get(
+    "SALES_SHARED_DIR",
+    "/dev/shm/sales_datasets" if os.path.isdir("/dev/shm") else os.path.join(CACHE_DIR, "shared"),
+)
+
+
+def _slug(name):
+    return name.lower().replace(" ", "_").replace(os.sep, "_")
+
+
+def dataset_path(name, version):
+    digest = hashlib.sha1(repr(version).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(SHARED_DIR, f"{_slug(name)}-{digest}.arrow")
+
+
+def publish_frame(df, path):
+    """Write df as an Arrow IPC file at path (atomically)."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_floating(field.type) and table.column(i).null_count:
+            # Keep NaN as a value rather than a null so the column maps zero-copy
+            table = table.set_column(i, field, pa.array(df.iloc[:, i].to_numpy(), type=field.type))
+
+    def write(tmp_path):
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    write_atomic(path, write)
+
+
+def attach_frame(path):
+    """Read-only DataFrame backed by a memory map of an Arrow IPC file."""
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    # One block per column, so numeric columns stay zero-copy views of the map
+    return table.to_pandas(split_blocks=True)
+
+
+def _remove_stale(name, keep_path):
+    # Older versions of exactly this name: "<slug>-<16 hex digits>.arrow"
+    prefix = f"{_slug(name)}-"
+    for entry in os.listdir(SHARED_DIR):
+        path = os.path.join(SHARED_DIR, entry)
+        if entry.startswith(prefix) and len(entry) == len(prefix) + 16 + len(".arrow") and entry.endswith(".arrow") and path != keep_path:
+            os.remove(path)
+
+
+def shared_frame(name, version, build):
+    """Frame for (name, version), built by the first process that asks for it.
+
+    Other processes wait on a file lock while it is being built and then
+    attach to the published file. The returned frame must not be mutated.
+    """
+    path = dataset_path(name, version)
+    if not os.path.exists(path):
+        os.makedirs(SHARED_DIR, exist_ok=True)
+        with open(os.path.join(SHARED_DIR, f"{_slug(name)}.lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if not os.path.exists(path):
+                publish_frame(build(), path)
+                _remove_stale(name, path)
+    return attach_frame(path)
+
+
+def shared_items(file_path, branch=None, months=None):
+    """load_items through the shared store."""
+    # Re-ingest a replaced workbook first, so the version names what is loaded
+    sync_source(file_path, branch)
+    # One name per (workbook, months): a branch can be served from different
+    # exports by different pages, and those must not evict each other
+    stem = os.path.splitext(os.path.basename(file_path))[0] if file_path else "store"
+    name = "-".join(part for part in ["items", branch, stem, *(months or ())] if part)
+    return shared_frame(name, dataset_version(file_path, branch, months) + (months,), lambda: load_items(file_path, branch, months))
+
+
+def clear_shared():
+    """Remove every published dataset (attached processes keep their maps)."""
+    if not os.path.isdir(SHARED_DIR):
+        return
+    for entry in os.listdir(SHARED_DIR):
+        os.remove(os.path.join(SHARED_DIR, entry))
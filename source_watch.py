@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+
+# ============================
+# Source watching and background reload
+# ============================
+# Each dataset a page serves (a branch's items, a price list, ...) is held
+# here together with the version of its sources (see
+# sales_store.dataset_version: size/mtime of the workbook, with the sidecar
+# cache falling back to a content hash, or the store's per-month hashes).
+# Version functions must stay read-only; any re-ingest of a replaced workbook
+# happens inside build, on the reload thread.
+#
+# Versions are re-checked at most every WATCH_INTERVAL seconds, on access and
+# from a daemon poller. When a source changes, only that dataset is rebuilt,
+# on a background thread; sessions keep getting the previous value until the
+# new one is complete and is swapped in under the lock in one assignment.
+# Only the very first load of a dataset blocks.
+
+WATCH_INTERVAL = float(os.environ.get("SALES_WATCH_INTERVAL", "2"))
+
+
+class SourceWatch:
+    def __init__(self, interval=WATCH_INTERVAL):
+        self.interval = interval
+        self._datasets = {}
+        self._lock = threading.Lock()
+        self._poller = None
+
+    def get(self, key, version, build):
+        """(version, value) for key, building it on first use.
+
+        version() returns a hashable token for the sources; build() returns
+        the value for the sources as they are now. Values are shared between
+        sessions and must not be mutated.
+        """
+        with self._lock:
+            entry = self._datasets.get(key)
+            if entry is None:
+                entry = self._datasets[key] = {
+                    "version_fn": version, "build": build, "current": None, "checked": 0.0,
+                    "reloading": False, "error": None, "ready": threading.Lock(),
+                }
+            # Later callers may close over fresher state (paths, months)
+            entry["version_fn"], entry["build"] = version, build
+
+        if entry["current"] is None:
+            # First load: build in this thread; concurrent first callers wait for it
+            with entry["ready"]:
+                if entry["current"] is None:
+                    token = version()
+                    entry["current"] = (token, build())
+                    entry["checked"] = time.monotonic()
+            self._start_poller()
+            return entry["current"]
+
+        self._check(key, entry)
+        return entry["current"]
+
+    def _check(self, key, entry, force=False):
+        now = time.monotonic()
+        with self._lock:
+            if entry["reloading"] or (not force and now - entry["checked"] < self.interval):
+                return
+            entry["checked"] = now
+        try:
+            token = entry["version_fn"]()
+        except Exception as e:
+            # Source missing or mid-copy; keep serving what we have
+            entry["error"] = e
+            return
+        if entry["current"] is not None and token == entry["current"][0]:
+            return
+        with self._lock:
+            if entry["reloading"]:
+                return
+            entry["reloading"] = True
+        threading.Thread(target=self._reload, args=(entry, token), name=f"reload-{key}", daemon=True).start()
+
+    def _reload(self, entry, token):
+        try:
+            value = entry["build"]()
+            with self._lock:
+                entry["current"] = (token, value)
+                entry["error"] = None
+        except Exception as e:
+            entry["error"] = e
+        finally:
+            with self._lock:
+                entry["reloading"] = False
+
+    def _start_poller(self):
+        with self._lock:
+            if self._poller is not None or self.interval <= 0:
+                return
+            self._poller = threading.Thread(target=self._poll, name="source-watch", daemon=True)
+        self._poller.start()
+
+    def _poll(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                entries = list(self._datasets.items())
+            for key, entry in entries:
+                if entry["current"] is not None:
+                    self._check(key, entry)
+
+    def reloading(self, key):
+        entry = self._datasets.get(key)
+        return entry is not None and entry["reloading"]
+
+    def error(self, key):
+        entry = self._datasets.get(key)
+        return None if entry is None else entry["error"]
+
+    def refresh(self, key):
+        """Re-check key's sources now and reload it in the background if they changed."""
+        entry = self._datasets.get(key)
+        if entry is not None and entry["current"] is not None:
+            self._check(key, entry, force=True)
@@ -0,0 +1,289 @@
+"""Embedded SQL over the sales store and the workbook sidecars (DuckDB).
+
+Every branch is exposed as views that DuckDB scans straight from Parquet: the
+per-month partitions of the sales store when the branch has been ingested,
+otherwise the workbook's Parquet sidecar (see data_cache.py). Nothing is
+loaded up front, so a query reads only the columns and row groups it needs.
+Everything runs in process; there is no server.
+
+Views per registered dataset (branch names are lower-cased, spaces -> _):
+
+  <name>          one row per item: Branch, Item Code, Items, Category,
+                  Total Sales, Total Profit, GP%, GP Band (as derive_totals)
+  <name>_months   one row per item and month: Branch, Month, Item Code,
+                  Items, Category, Sales, Profit
+
+plus `sales` and `sales_months` over every branch in the registry, and
+`price_list` when a price-list workbook is registered.
+
+The dashboard filters, Key Insights, negative-GP% counts and category
+summary are available as SQL (sql_key_insights and friends), with the
+filters pushed into the WHERE clause. Ad-hoc queries run from query.py or:
+
+    python sql_engine.py "SELECT Category, sum(\"Total Sales\") FROM sales GROUP BY 1"
+"""
+import argparse
+import os
+import threading
+
+import duckdb
+import pandas as pd
+
+from branches import BRANCHES, GP_BINS, GP_OPTIONS
+from data_cache import CACHE_DIR, cached_parquet_path
+from months import month_columns
+from sales_store import STORE_DIR, TOTAL_ROW_RE, branch_dir, covered_months, sync_source
+
+
+def _ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def view_name(name):
+    return name.lower().replace(" ", "_")
+
+
+def _gp_band_sql(column='"GP%"'):
+    # Same half-open ranges as branches.gp_band
+    cases = " ".join(
+        f"WHEN {column} < {upper} THEN {_literal(label)}"
+        for upper, label in zip(GP_BINS[1:-1], GP_OPTIONS[1:])
+    )
+    return f"CASE {cases} ELSE {_literal(GP_OPTIONS[-1])} END"
+
+
+def _not_total_sql():
+    # Same rows as sales_store.drop_total_rows keeps
+    return f"NOT coalesce(regexp_matches(CAST(\"Item Code\" AS VARCHAR), {_literal(TOTAL_ROW_RE)}, 'i'), false)"
+
+
+# ============================
+# Sources
+# ============================
+def _store_sources(branch, months):
+    # Item rows and month facts read from the store's monthly partitions
+    facts = " UNION ALL ".join(
+        f"SELECT {_literal(month)} AS Month, {order} AS month_order, "
+        f"\"Item Code\", Items, Category, \"Total Sales\" AS Sales, \"Total Profit\" AS Profit, "
+        # Repeated item codes line up one-to-one across months, as in read_branch
+        f"row_number() OVER (PARTITION BY \"Item Code\" ORDER BY file_row_number) AS item_repeat "
+        f"FROM read_parquet({_literal(os.path.abspath(os.path.join(branch_dir(branch), f'{month}.parquet')))}, file_row_number = true) "
+        f"WHERE {_not_total_sql()}"
+        for order, month in enumerate(months)
+    )
+    items = (
+        f"SELECT \"Item Code\", "
+        f"arg_max(Items, month_order) FILTER (WHERE Items IS NOT NULL) AS Items, "
+        f"arg_max(Category, month_order) FILTER (WHERE Category IS NOT NULL) AS Category, "
+        f"sum(Sales) AS \"Total Sales\", sum(Profit) AS \"Total Profit\" "
+        f"FROM ({facts}) GROUP BY \"Item Code\", item_repeat "
+        # Items with no facts in these months, as in read_branch
+        f"HAVING bool_or(Sales <> 0 OR Profit <> 0)"
+    )
+    month_facts = f"SELECT Month, \"Item Code\", Items, Category, Sales, Profit FROM ({facts}) WHERE Sales <> 0 OR Profit <> 0"
+    return items, month_facts
+
+
+def _workbook_sources(con, file_path):
+    # Item rows and month facts read from the workbook's Parquet sidecar
+    parquet_path = cached_parquet_path(file_path)
+    if parquet_path is None:
+        raise ValueError(f"{file_path} has no Parquet sidecar to query")
+    scan = f"read_parquet({_literal(os.path.abspath(parquet_path))})"
+    columns = [row[0] for row in con.execute(f"DESCRIBE SELECT * FROM {scan}").fetchall()]
+    months = month_columns(columns)
+    total = lambda cols: " + ".join(f"coalesce({_ident(col)}, 0)" for col in cols) or "0"
+    items = (
+        f"SELECT CAST(\"Item Code\" AS VARCHAR) AS \"Item Code\", Items, Category, "
+        f"{total([sales for sales, _ in months.values()])} AS \"Total Sales\", "
+        f"{total([profit for _, profit in months.values()])} AS \"Total Profit\" FROM {scan} WHERE {_not_total_sql()}"
+    )
+    month_facts = " UNION ALL ".join(
+        f"SELECT {_literal(month)} AS Month, CAST(\"Item Code\" AS VARCHAR) AS \"Item Code\", Items, Category, "
+        f"coalesce({_ident(sales)}, 0) AS Sales, coalesce({_ident(profit)}, 0) AS Profit FROM {scan} "
+        f"WHERE {_not_total_sql()}"
+        for month, (sales, profit) in months.items()
+    )
+    return items, month_facts
+
+
+# ============================
+# Engine
+# ============================
+class SalesSQL:
+    """In-process DuckDB database holding one set of views per dataset."""
+
+    def __init__(self):
+        self.con = duckdb.connect(":memory:")
+        self.tables = {}
+        self._lock = threading.Lock()
+
+    def register_sales(self, name, file_path, branch=None, months=None):
+        """Create the <name> and <name>_months views; returns the item view's name."""
+        name = view_name(name)
+        # Re-ingest a replaced workbook first, so the views read its current data
+        sync_source(file_path, branch)
+        covered = covered_months(branch, months, file_path)
+        with self._lock:
+            if covered is not None:
+                items, month_facts = _store_sources(branch, covered)
+            else:
+                items, month_facts = _workbook_sources(self.con, file_path)
+            label = _literal(branch or name)
+            self.con.execute(
+                f"CREATE OR REPLACE VIEW {_ident(name)} AS "
+                f"SELECT *, {_gp_band_sql()} AS \"GP Band\" FROM ("
+                f"SELECT {label} AS Branch, \"Item Code\", Items, coalesce(Category, 'Unknown') AS Category, "
+                f"\"Total Sales\", \"Total Profit\", "
+                f"CASE WHEN \"Total Sales\" <> 0 THEN round(\"Total Profit\" / \"Total Sales\" * 100, 2) ELSE 0 END AS \"GP%\" "
+                f"FROM ({items}))"
+            )
+            self.con.execute(
+                f"CREATE OR REPLACE VIEW {_ident(name + '_months')} AS "
+                f"SELECT {label} AS Branch, Month, \"Item Code\", Items, coalesce(Category, 'Unknown') AS Category, "
+                f"Sales, Profit FROM ({month_facts})"
+            )
+        self.tables[name] = "items"
+        self.tables[name + "_months"] = "item x month"
+        return name
+
+    def register_branches(self, branches=BRANCHES):
+        """Register every branch plus the `sales` / `sales_months` union views."""
+        names = [self.register_sales(branch, info["file"], branch, info.get("months")) for branch, info in branches.items()]
+        with self._lock:
+            for suffix in ("", "_months"):
+                union = " UNION ALL BY NAME ".join(f"SELECT * FROM {_ident(name + suffix)}" for name in names)
+                self.con.execute(f"CREATE OR REPLACE VIEW {_ident('sales' + suffix)} AS {union}")
+        self.tables["sales"] = "items, every branch"
+        self.tables["sales_months"] = "item x month, every branch"
+        return names
+
+    def register_price_list(self, file_path, name="price_list"):
+        parquet_path = cached_parquet_path(file_path)
+        if parquet_path is None:
+            raise ValueError(f"{file_path} has no Parquet sidecar to query")
+        with self._lock:
+            self.con.execute(f"CREATE OR REPLACE VIEW {_ident(name)} AS SELECT * FROM read_parquet({_literal(os.path.abspath(parquet_path))})")
+        self.tables[name] = "price list"
+        return name
+
+    def restrict(self, directories=(STORE_DIR, CACHE_DIR)):
+        """Limit file access to the views' Parquet directories, for good.
+
+        Call once every view is registered: afterwards queries can't read or
+        write other files, and the settings themselves can't be changed.
+        """
+        allowed = ", ".join(_literal(os.path.join(os.path.abspath(directory), "")) for directory in directories)
+        with self._lock:
+            self.con.execute(f"SET allowed_directories = [{allowed}]")
+            self.con.execute("SET enable_external_access = false")
+            self.con.execute("SET lock_configuration = true")
+
+    def select(self, sql):
+        """Run a single SELECT / WITH statement typed by a user; anything else raises ValueError."""
+        statements = self.con.extract_statements(sql)
+        if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+            raise ValueError("Only a single SELECT (or WITH ... SELECT) statement can be run")
+        return self.query(sql)
+
+    def query(self, sql, params=None):
+        """Run sql and return a DataFrame; safe to call from several sessions."""
+        # Each call gets its own cursor, so concurrent sessions don't share state
+        cursor = self.con.cursor()
+        try:
+            return cursor.execute(sql, params or []).fetchdf()
+        finally:
+            cursor.close()
+
+
+# ============================
+# Dashboard Queries
+# ============================
+def filter_sql(selected_category='All', exclude_categories=(), selected_gp='All'):
+    """WHERE clause and parameters for the sidebar filters."""
+    clauses, params = [], []
+    if selected_category != 'All':
+        clauses.append("Category = ?")
+        params.append(selected_category)
+    if exclude_categories:
+        clauses.append(f"Category NOT IN ({', '.join('?' for _ in exclude_categories)})")
+        params.extend(exclude_categories)
+    if selected_gp != 'All':
+        clauses.append("\"GP Band\" = ?")
+        params.append(selected_gp)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def sql_key_insights(engine, table, *filters):
+    """Key Insights numbers (see reports.key_insights)."""
+    where, params = filter_sql(*filters)
+    row = engine.query(
+        f"SELECT coalesce(sum(\"Total Sales\"), 0) AS total_sales, coalesce(sum(\"Total Profit\"), 0) AS total_profit, "
+        f"coalesce(round(avg(\"GP%\"), 2), 0) AS avg_gp FROM {_ident(table)}{where}",
+        params,
+    ).iloc[0]
+    total_sales, total_profit = row['total_sales'], row['total_profit']
+    return {
+        'total_sales': total_sales,
+        'total_profit': total_profit,
+        'avg_gp': row['avg_gp'],
+        'overall_gp': (total_profit / total_sales) if total_sales != 0 else 0,
+    }
+
+
+def sql_negative_gp(engine, table, *filters):
+    """Negative-GP% item count per category (see reports.negative_gp_by_category)."""
+    where, params = filter_sql(*filters)
+    where = f"{where} AND \"GP%\" < 0" if where else " WHERE \"GP%\" < 0"
+    return engine.query(
+        f"SELECT Category, count(*) AS \"Negative Item Count\" FROM {_ident(table)}{where} "
+        f"GROUP BY Category ORDER BY \"Negative Item Count\" DESC",
+        params,
+    )
+
+
+def sql_category_summary(engine, table, *filters):
+    """Sales, profit and GP per category (see reports.category_gp_summary)."""
+    where, params = filter_sql(*filters)
+    return engine.query(
+        f"SELECT Category, sum(\"Total Sales\") AS \"Total Sales\", sum(\"Total Profit\") AS \"Total Profit\", "
+        f"sum(\"Total Profit\") / CASE WHEN sum(\"Total Sales\") = 0 THEN 1 ELSE sum(\"Total Sales\") END AS GP "
+        f"FROM {_ident(table)}{where} GROUP BY Category ORDER BY Category",
+        params,
+    )
+
+
+def sql_report(job, selected_category='All', exclude_categories=(), selected_gp='All'):
+    """reports.build_report computed by DuckDB instead of pandas."""
+    engine = SalesSQL()
+    table = engine.register_sales("report", job["file"], job.get("branch"), job.get("months"))
+    filters = (selected_category, tuple(exclude_categories), selected_gp)
+    return {
+        "key_insights": pd.DataFrame([sql_key_insights(engine, table, *filters)]),
+        "negative_gp_by_category": sql_negative_gp(engine, table, *filters),
+        "category_summary": sql_category_summary(engine, table, *filters),
+    }
+
+
+# ============================
+# CLI
+# ============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sql", help="query over the sales / <branch> views")
+    parser.add_argument("--price-list", help="also register this workbook as price_list")
+    args = parser.parse_args(argv)
+
+    engine = SalesSQL()
+    engine.register_branches()
+    if args.price_list:
+        engine.register_price_list(args.price_list)
+    print(engine.query(args.sql).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,78 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from branches import GP_OPTIONS, derive_totals
+from agg_cache import AggregateCache
+from charts import chart_section, gp_distribution_section, negative_gp_bar
+from debug_panel import memory_panel, start_rerun_trace, timing_panel
+from filter_index import build_filter_index, display_columns
+from gp_sketch import merge_histograms
+from perf_trace import stage
+from reports import filter_items
+from rollup_cube import cube_category_summary, cube_insights, cube_negative_gp, load_cube, slice_cube
+from sales_store import dataset_version, load_sales
+from shared_store import shared_items
+from source_watch import SourceWatch
+from table_view import export_panel, paginated_table
 
 # ============================
 # Page Config
 # ============================
 st.set_page_config(page_title="Sales & Profit Dashboard", layout="wide")
 st.title("📊 Sales & Profit Insights (Jul-Sep 2025)")
+start_rerun_trace("stock")
 
 # ============================
 # Load Data
 # ============================
-@st.cache_data
-def load_data(file_path):
+# Reloaded in the background when the workbook changes (see source_watch.py)
+@st.cache_resource
+def source_watch():
+    return SourceWatch()
+
+def build_data(file_path, branch=None, months=None):
+    # Read-only frame attached from the shared store, shared by all sessions
+    # and, through the memory map, by every dashboard process; Category fill,
+    # Total Sales/Profit, GP% and GP band, then compact dtypes. The filter
+    # index and the rollup cube (summary metrics and charts) are built with it.
+    df = shared_items(file_path, branch, months)
+    return {"items": df, "filter_index": build_filter_index(df), "cube": load_cube(file_path, branch, months)}
+
+def load_data(file_path, branch=None, months=None):
     try:
-        df = pd.read_excel(file_path)
+        return source_watch().get(
+            (file_path, branch, months),
+            lambda: dataset_version(file_path, branch, months),
+            lambda: build_data(file_path, branch, months),
+        )
     except Exception as e:
         st.error(f"Error loading file: {e}")
-        return pd.DataFrame()  # Return empty DataFrame if error
-
-    # Fill missing categories
-    df['Category'] = df['Category'].fillna('Unknown')
+        return None, None
 
-    # Calculate total sales and total profit
-    sales_cols = [col for col in df.columns if 'Total Sales' in col]
-    profit_cols = [col for col in df.columns if 'Total Profit' in col]
-    df['Total Sales'] = df[sales_cols].sum(axis=1)
-    df['Total Profit'] = df[profit_cols].sum(axis=1)
+# Shared by all sessions; keyed by (dataset version, filter state)
+@st.cache_resource
+def aggregate_cache():
+    return AggregateCache()
 
-    # Calculate GP%
-    df['GP%'] = (df['Total Profit'] / df['Total Sales'] * 100).round(2)
-    df['GP%'] = df['GP%'].replace([float('inf'), -float('inf')], 0).fillna(0)
-    return df
+def negative_gp_figures(cube):
+    neg_count_by_category = cube_negative_gp(cube)
+    return [negative_gp_bar(neg_count_by_category)] if not neg_count_by_category.empty else []
 
 # ============================
 # Load File
 # ============================
 file_path = "july to sep safa2025.Xlsx"
-df = load_data(file_path)
+branch = "Safa"
+months = ("Jul-2025", "Aug-2025", "Sep-2025")
+with stage("load"):
+    version, data = load_data(file_path, branch, months)
 
-if df.empty:
+if data is None or data["items"].empty:
     st.warning("No data loaded. Please check the file.")
 else:
+    df = data["items"]
+    if source_watch().reloading((file_path, branch, months)):
+        st.caption("🔄 Newer data found; reloading in the background.")
+
     # ============================
     # Sidebar Filters
     # ============================
@@ -55,45 +86,39 @@ else:
     exclude_categories = st.sidebar.multiselect("Exclude Categories", options=df['Category'].unique().tolist())
 
     # GP% filter (single selection with "All")
-    gp_options = ['All', "<5%", "5-10%", "10-20%", "20-30%", "30%+"]
-    selected_gp = st.sidebar.selectbox("Select GP% Range", options=gp_options, index=0)
+    selected_gp = st.sidebar.selectbox("Select GP% Range", options=GP_OPTIONS, index=0)
 
     # ============================
     # Apply Filters
     # ============================
-    filtered_df = df.copy()
-
-    if selected_category != 'All':
-        filtered_df = filtered_df[filtered_df['Category'] == selected_category]
-
-    if exclude_categories:
-        filtered_df = filtered_df[~filtered_df['Category'].isin(exclude_categories)]
-
-    if selected_gp != 'All':
-        if selected_gp == "<5%":
-            filtered_df = filtered_df[filtered_df['GP%'] < 5]
-        elif selected_gp == "5-10%":
-            filtered_df = filtered_df[(filtered_df['GP%'] >= 5) & (filtered_df['GP%'] < 10)]
-        elif selected_gp == "10-20%":
-            filtered_df = filtered_df[(filtered_df['GP%'] >= 10) & (filtered_df['GP%'] < 20)]
-        elif selected_gp == "20-30%":
-            filtered_df = filtered_df[(filtered_df['GP%'] >= 20) & (filtered_df['GP%'] < 30)]
-        elif selected_gp == "30%+":
-            filtered_df = filtered_df[filtered_df['GP%'] >= 30]
+    # Slice only the selected rows via the precomputed index (no full-frame copy)
+    with stage("filter"):
+        filtered_df = display_columns(filter_items(df, selected_category, exclude_categories, selected_gp, data["filter_index"]))
+
+    with stage("aggregate"):
+        filter_key = (version, selected_category, tuple(sorted(exclude_categories)), selected_gp)
+        cube = slice_cube(data["cube"], selected_category, exclude_categories, selected_gp)
+        aggregates = aggregate_cache().get_or_compute(filter_key, lambda: cube_insights(cube))
 
     # ============================
     # Key Insights at Top
     # ============================
     st.markdown("### Key Insights")
-    total_sales = filtered_df['Total Sales'].sum()
-    total_profit = filtered_df['Total Profit'].sum()
-    avg_gp = filtered_df['GP%'].mean().round(2) if not filtered_df.empty else 0
+    total_sales = aggregates['total_sales']
+    total_profit = aggregates['total_profit']
+    avg_gp = aggregates['avg_gp']
 
     col1, col2, col3 = st.columns(3)
     col1.metric("Total Sales", f"{total_sales:,.0f}")
     col2.metric("Total Profit", f"{total_profit:,.0f}")
     col3.metric("Average GP%", f"{avg_gp}%")
 
+    # ============================
+    # GP% Distribution
+    # ============================
+    # Percentiles and sales-weighted GP from the cube's GP% histogram
+    gp_distribution_section(cube["hist"], "gp_distribution", aggregate_cache(), filter_key)
+
     # ============================
     # Display Table
     # ============================
@@ -101,42 +126,25 @@ else:
     if filtered_df.empty:
         st.info("No items match the selected filters.")
     else:
-        st.dataframe(filtered_df.reset_index(drop=True))
+        with stage("table"):
+            paginated_table(filtered_df.reset_index(drop=True), key="items")
+        export_panel({
+            "Filtered Items": filtered_df,
+            "Category Summary": lambda: cube_category_summary(cube),
+            "Negative GP by Category": lambda: cube_negative_gp(cube),
+            "GP% Histogram": lambda: merge_histograms(cube["hist"]),
+        }, key="export_stock")
 
         # ============================
         # Category-wise Count of Negative GP% Items
         # ============================
-        st.markdown("### 📉 Categories with Most Negative GP% Items")
-
-        # Filter only negative GP% items
-        negative_items = filtered_df[filtered_df['GP%'] < 0]
-
-        # Group and count
-        neg_count_by_category = (
-            negative_items.groupby('Category')
-            .size()
-            .reset_index(name='Negative Item Count')
-            .sort_values(by='Negative Item Count', ascending=False)
+        # Negative GP% item count per category, built only when the section is open
+        chart_section(
+            "📉 Categories with Most Negative GP% Items", "negative_gp",
+            lambda: negative_gp_figures(cube), aggregate_cache(), filter_key,
+            empty_message="No categories have items with negative GP%.",
         )
 
-        if neg_count_by_category.empty:
-            st.info("No categories have items with negative GP%.")
-        else:
-            fig = px.bar(
-                neg_count_by_category,
-                x='Category',
-                y='Negative Item Count',
-                text='Negative Item Count',
-                color='Negative Item Count',
-                color_continuous_scale='Reds',
-                title="Number of Items with Negative GP% by Category",
-            )
-            fig.update_traces(texttemplate='%{text}', textposition='outside')
-            fig.update_layout(
-                xaxis_title="Category",
-                yaxis_title="Count of Negative GP% Items",
-                plot_bgcolor='rgba(0,0,0,0)',
-                height=500,
-                showlegend=False
-            )
-            st.plotly_chart(fig, use_container_width=True)
+    memory_panel({"Sales": (lambda: derive_totals(load_sales(file_path, branch, months)), df)})
+
+timing_panel()
@@ -0,0 +1,155 @@
+import math
+import os
+import tempfile
+import time
+
+import numpy as np
+import streamlit as st
+
+from export_stream import FORMATS, write_csv, write_xlsx
+
+# ============================
+# Paginated Item Table
+# ============================
+# The item table is sorted and sliced on the server and only the visible page
+# is formatted and sent to the browser, instead of serializing every row on
+# each rerun.
+
+PAGE_SIZE_OPTIONS = [25, 50, 100, 250, 500]
+DEFAULT_PAGE_SIZE = int(os.environ.get("SALES_TABLE_PAGE_SIZE", "100"))
+FILE_ORDER = "(file order)"
+EXPORT_DIR = os.environ.get("SALES_EXPORT_DIR", os.path.join(tempfile.gettempdir(), "sales_exports"))
+EXPORT_MAX_AGE = float(os.environ.get("SALES_EXPORT_MAX_AGE", "3600"))
+
+
+def sort_positions(df, sort_by=None, ascending=True):
+    """Row positions of df in display order (stable, missing values last)."""
+    if sort_by is None or sort_by not in df.columns:
+        return np.arange(len(df))
+    values = df[sort_by]
+    if values.dtype.kind in "biuf":
+        # argsort puts NaN last in both directions
+        keys = values.to_numpy(dtype="float64", na_value=np.nan)
+        return np.argsort(keys if ascending else -keys, kind="stable")
+    return (
+        values.reset_index(drop=True)
+        .sort_values(ascending=ascending, kind="stable", na_position="last")
+        .index.to_numpy()
+    )
+
+
+def page_bounds(n_rows, page, page_size):
+    n_pages = max(1, math.ceil(n_rows / page_size))
+    page = min(max(1, page), n_pages)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, n_rows), n_pages
+
+
+def paginated_table(df, key, default_sort=None, ascending=True, render_page=None):
+    """Show df one page at a time.
+
+    render_page(page_df) may add or format columns; it only ever sees the
+    rows on the current page.
+    """
+    if df.empty:
+        st.dataframe(df)
+        return
+
+    sort_options = [FILE_ORDER] + df.columns.tolist()
+    col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
+    sort_by = col1.selectbox(
+        "Sort by", sort_options,
+        index=sort_options.index(default_sort) if default_sort in sort_options else 0,
+        key=f"{key}_sort",
+    )
+    order = col2.selectbox(
+        "Order", ["Ascending", "Descending"], index=0 if ascending else 1, key=f"{key}_order",
+    )
+    page_size = col3.selectbox(
+        "Rows per page", PAGE_SIZE_OPTIONS,
+        index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE) if DEFAULT_PAGE_SIZE in PAGE_SIZE_OPTIONS else 2,
+        key=f"{key}_page_size",
+    )
+    n_pages = max(1, math.ceil(len(df) / page_size))
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        # Filters or page size shrank the table under the selected page
+        st.session_state[f"{key}_page"] = n_pages
+    page = col4.number_input("Page", min_value=1, max_value=n_pages, step=1, key=f"{key}_page")
+
+    start, end, n_pages = page_bounds(len(df), int(page), page_size)
+    positions = sort_positions(df, None if sort_by == FILE_ORDER else sort_by, order == "Ascending")
+    page_df = df.iloc[positions[start:end]]
+    if render_page is not None:
+        page_df = render_page(page_df)
+
+    st.dataframe(page_df)
+    st.caption(f"Rows {start + 1:,}–{end:,} of {len(df):,} (page {int(page)} of {n_pages})")
+
+
+# ============================
+# Download Panel
+# ============================
+def _slug(name):
+    return "".join(ch if ch.isalnum() else "_" for ch in name.lower()).strip("_")
+
+
+def remove_stale_exports(max_age=EXPORT_MAX_AGE):
+    """Delete export files older than max_age seconds, whichever session made them."""
+    if not os.path.isdir(EXPORT_DIR):
+        return
+    cutoff = time.time() - max_age
+    for name in os.listdir(EXPORT_DIR):
+        path = os.path.join(EXPORT_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass  # Removed by another session meanwhile
+
+
+def _read_export(path):
+    # Called by download_button only when the button is clicked
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def export_panel(tables, key):
+    """Download buttons for {name: frame or callable returning a frame}.
+
+    Nothing is built or written until "Prepare download" is clicked; the file
+    is then streamed to disk in chunks (see export_stream.py) and offered for
+    download until the next export from this panel, or until it is older than
+    EXPORT_MAX_AGE. The file is read only when the download is clicked, not
+    on every rerun.
+    """
+    with st.expander("⬇️ Export"):
+        col1, col2 = st.columns(2)
+        fmt = col1.selectbox("Format", FORMATS, key=f"{key}_export_format")
+        # XLSX holds every table as its own sheet; CSV is one table per file
+        names = list(tables) if fmt == "xlsx" else [col2.selectbox("Table", list(tables), key=f"{key}_export_table")]
+
+        state_key = f"{key}_export_file"
+        if st.button("Prepare download", key=f"{key}_export_prepare"):
+            previous = st.session_state.pop(state_key, None)
+            if previous is not None and os.path.exists(previous[0]):
+                os.remove(previous[0])
+            remove_stale_exports()
+            frames = {name: tables[name]() if callable(tables[name]) else tables[name] for name in names}
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            fd, path = tempfile.mkstemp(prefix=f"{_slug(key)}-", suffix=f".{fmt}", dir=EXPORT_DIR)
+            os.close(fd)
+            if fmt == "xlsx":
+                write_xlsx(frames, path)
+                file_name = f"{_slug(key)}.xlsx"
+            else:
+                write_csv(frames[names[0]], path)
+                file_name = f"{_slug(key)}-{_slug(names[0])}.csv"
+            st.session_state[state_key] = (path, file_name)
+
+        prepared = st.session_state.get(state_key)
+        if prepared is not None and os.path.exists(prepared[0]):
+            path, file_name = prepared
+            st.download_button(
+                f"Download {file_name}", lambda: _read_export(path), file_name=file_name,
+                key=f"{key}_export_download",
+            )
@@ -0,0 +1,16 @@
+import numpy as np
+
+# ============================
+# Vectorized ratios
+# ============================
+# Per-row totals come from months.build_month_view (bincounts over the long
+# month facts); this module keeps the division helper they share.
+
+
+def safe_ratio(numerator, denominator):
+    numerator = np.asarray(numerator, dtype="float64")
+    denominator = np.asarray(denominator, dtype="float64")
+    out = np.zeros(np.broadcast(numerator, denominator).shape, dtype="float64")
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
@@ -1,43 +1,146 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
+
+from agg_cache import AggregateCache
+from branches import ALL_BRANCHES, BASE_PERIOD, CURRENT_PERIOD
+from charts import category_bars, chart_section, monthly_bar
+from compact import compact_frame, fill_category
+from data_cache import read_excel_cached
+from debug_panel import memory_panel, start_rerun_trace, timing_panel
+from inventory import build_inventory, category_inventory, dead_stock
+from months import build_month_view, month_columns, month_table
+from perf_trace import stage
+from period_variance import (
+    TOP_MOVERS, all_branches_variance, branch_variance, comparable_branches, comparison_months, top_movers,
+    variance_totals,
+)
+from price_join import build_price_sales_join, joined_rows
+from rollup_cube import cube_category_summary, cube_monthly, load_cube, slice_cube
+from sales_store import dataset_version, load_sales, sync_source
+from search_index import build_search_index, search_items
+from shared_store import shared_frame
+from source_watch import SourceWatch
+from table_view import export_panel, paginated_table
 
 # ================================
 # Page Config
 # ================================
 st.set_page_config(page_title="Sales & Profit Dashboard", layout="wide")
 st.title("📊 Sales & Profit Insights (Jul-Sep)")
+start_rerun_trace("variance")
 
 # ================================
 # Load Data
 # ================================
-@st.cache_data
-def load_sales_data(file_path):
-    df = pd.read_excel(file_path)
-    df['Item Code'] = df['Item Code'].astype(str)
-    return df
+def build_sales_data(file_path, branch=None, months=None):
+    df = load_sales(file_path, branch, months)
+    df['Item Code'] = df['Item Code'].astype(str).astype('category')
+    return compact_frame(df)
+
+def build_price_list(file_path):
+    df_price = read_excel_cached(file_path)
+    df_price['Item Bar Code'] = df_price['Item Bar Code'].astype(str).astype('category')
+    return compact_frame(df_price)
+
+# Read-only frames attached from the shared store (see shared_store.py), so
+# every session and dashboard process maps one copy
+def load_sales_data(file_path, branch=None, months=None):
+    sync_source(file_path, branch)
+    version = dataset_version(file_path, branch, months) + (months,)
+    return shared_frame(f"sales-{branch or file_path}", version, lambda: build_sales_data(file_path, branch, months))
 
-@st.cache_data
 def load_price_list(file_path):
-    df_price = pd.read_excel(file_path)
-    df_price['Item Bar Code'] = df_price['Item Bar Code'].astype(str)
-    return df_price
+    return shared_frame(f"price-{file_path}", dataset_version(file_path), lambda: build_price_list(file_path))
+
+# The sales frame with everything derived from it (month view, rollup cube),
+# and the price list with its search index and join, are each built as one
+# unit and reloaded in the background when a workbook changes (see
+# source_watch.py)
+@st.cache_resource
+def source_watch():
+    return SourceWatch()
+
+def build_sales(file_path, branch=None, months=None):
+    sales_df = load_sales_data(file_path, branch, months)
+    # Item attributes + totals, with per-month figures kept in long form.
+    # Shallow copy: the shared frame itself must not be modified
+    df = sales_df.copy(deep=False)
+    if 'Category' not in df.columns:
+        df['Category'] = 'Unknown'
+    else:
+        df['Category'] = fill_category(df['Category'], 'Unknown')
+    # Month-wise and category charts are answered from the rollup cube
+    return {"sales_df": sales_df, "view": build_month_view(df), "cube": load_cube(file_path, branch, months)}
+
+def build_join(price_file, sales_file, branch=None, months=None):
+    # The search index is built with the join so its price-list rows always
+    # line up with the join's
+    price_df = load_price_list(price_file)
+    join = build_price_sales_join(price_df, load_sales_data(sales_file, branch, months))
+    joined = join["joined"]
+    # Price-list items without sales show zero sales/profit
+    month_cols = [col for pair in month_columns(joined.columns).values() for col in pair]
+    joined[month_cols] = joined[month_cols].fillna(0)
+    if 'Category' not in joined.columns:
+        joined['Category'] = 'Unknown'
+    else:
+        joined['Category'] = fill_category(joined['Category'], 'Unknown')
+    view = build_month_view(joined)
+    return {
+        "price_df": price_df, "search_index": build_search_index(price_df),
+        "join": join, "view": view, "inventory": build_inventory(join, view),
+    }
+
+# Shared by all sessions; keyed by (dataset versions, search/filter state)
+@st.cache_resource
+def aggregate_cache():
+    return AggregateCache()
+
+def compute_aggregates(filtered_df):
+    total_sales = filtered_df['Total Sales'].sum()
+    total_profit = filtered_df['Total Profit'].sum()
+    return {
+        'total_sales': total_sales,
+        'total_profit': total_profit,
+        'overall_gp': (total_profit / total_sales) if total_sales != 0 else 0,
+    }
+
+# Chart data is read from the cube inside the figure builders, so it is only
+# computed when its section is open
+def monthly_figures(cube, months):
+    monthly = cube_monthly(cube, months)
+    monthly_df = monthly.melt(id_vars='Month', value_vars=['Sales','Profit'], var_name='Type', value_name='Value')
+    return [monthly_bar(monthly_df)]
+
+def category_figures(cube):
+    return category_bars(cube_category_summary(cube))
 
 # ================================
 # File paths
 # ================================
 sales_file = "july to sep safa2025.Xlsx"  # replace with your file
 price_file = "price list(1).xlsx"            # replace with your file
-
-sales_df = load_sales_data(sales_file)
-price_df = load_price_list(price_file)
-
-# Fill missing sales columns if not in sales
-for col in ['Jul-2025 Total Sales','Jul-2025 Total Profit',
-            'Aug-2025 Total Sales','Aug-2025 Total Profit',
-            'Sep-2025 Total Sales','Sep-2025 Total Profit']:
-    if col not in sales_df.columns:
-        sales_df[col] = 0
+branch = "Safa"
+period_months = ("Jul-2025", "Aug-2025", "Sep-2025")  # read from the sales store when ingested
+
+sales_key = ("sales", sales_file, branch, period_months)
+join_key = ("join", price_file, sales_file, branch, period_months)
+with stage("load"):
+    watch = source_watch()
+    sales_version, sales = watch.get(
+        sales_key, lambda: dataset_version(sales_file, branch, period_months),
+        lambda: build_sales(sales_file, branch, period_months),
+    )
+    join_version, joined = watch.get(
+        join_key, lambda: (dataset_version(sales_file, branch, period_months), dataset_version(price_file)),
+        lambda: build_join(price_file, sales_file, branch, period_months),
+    )
+    sales_df = sales["sales_df"]
+    price_df = joined["price_df"]
+    price_sales_join = joined["join"]
+if any(watch.reloading(key) for key in (sales_key, join_key)):
+    st.caption("🔄 Newer data found; reloading in the background.")
 
 # ================================
 # Sidebar Filters
@@ -55,70 +158,44 @@ selected_category = st.sidebar.selectbox("Select Category", all_categories)
 # ================================
 # Filter Logic
 # ================================
-if item_search or barcode_search:
-    # Search in price list
-    search_base = price_df.copy()
-    if item_search:
-        search_base = search_base[search_base['Item Name'].str.contains(item_search, case=False, na=False)]
-    if barcode_search:
-        search_base = search_base[search_base['Item Bar Code'].str.contains(barcode_search, case=False, na=False)]
-
-    # Merge with sales data
-    filtered_df = pd.merge(search_base, sales_df, left_on='Item Bar Code', right_on='Item Code', how='left')
-
-    # Fill missing sales/profit columns
-    sales_cols = ['Jul-2025 Total Sales','Jul-2025 Total Profit',
-                  'Aug-2025 Total Sales','Aug-2025 Total Profit',
-                  'Sep-2025 Total Sales','Sep-2025 Total Profit']
-    for col in sales_cols:
-        if col not in filtered_df.columns:
-            filtered_df[col] = 0
-        else:
-            filtered_df[col] = filtered_df[col].fillna(0)
+with stage("filter"):
+    if item_search or barcode_search:
+        # Search in price list, then slice the precomputed join
+        view = joined["view"]
+        price_rows = search_items(joined["search_index"], item_search, barcode_search)
+        rows = joined_rows(price_sales_join, price_rows)
+
+        # --- Handle case when no match is found ---
+        if len(rows) == 0:
+            st.warning("❌ Item not found in the data.")
+            st.stop()
 
-    # Category column
-    if 'Category' not in filtered_df.columns:
-        filtered_df['Category'] = 'Unknown'
     else:
-        filtered_df['Category'] = filtered_df['Category'].fillna('Unknown')
+        # Default view (no search)
+        view = sales["view"]
+        rows = np.arange(len(view["items"]))
 
-    # --- Handle case when no match is found ---
-    if filtered_df.empty:
-        st.warning("❌ Item not found in the data.")
-        st.stop()
+    # Apply category filter
+    if selected_category != "All" and not (item_search or barcode_search):
+        rows = rows[view["items"]['Category'].to_numpy()[rows] == selected_category]
 
-else:
-    # Default view (no search)
-    filtered_df = sales_df.copy()
-    if 'Category' not in filtered_df.columns:
-        filtered_df['Category'] = 'Unknown'
-    else:
-        filtered_df['Category'] = filtered_df['Category'].fillna('Unknown')
+    # Total Sales, Total Profit and Overall GP are precomputed per item
+    filtered_df = view["items"].iloc[rows]
 
-# Apply category filter
-if selected_category != "All" and not (item_search or barcode_search):
-    filtered_df = filtered_df[filtered_df['Category'] == selected_category]
-
-# ================================
-# Compute Totals
-# ================================
-def compute_row_totals(row):
-    sales_cols = ['Jul-2025 Total Sales','Aug-2025 Total Sales','Sep-2025 Total Sales']
-    profit_cols = ['Jul-2025 Total Profit','Aug-2025 Total Profit','Sep-2025 Total Profit']
-
-    total_sales = sum([row[col] if pd.notna(row[col]) else 0 for col in sales_cols])
-    total_profit = sum([row[col] if pd.notna(row[col]) else 0 for col in profit_cols])
-    overall_gp = (total_profit / total_sales) if total_sales != 0 else 0
-    return pd.Series([total_sales, total_profit, overall_gp])
-
-filtered_df[['Total Sales','Total Profit','Overall GP']] = filtered_df.apply(compute_row_totals, axis=1)
+searching = bool(item_search or barcode_search)
+filter_key = (
+    join_version if searching else sales_version,
+    item_search, barcode_search, selected_category if not searching else None,
+)
+with stage("aggregate"):
+    aggregates = aggregate_cache().get_or_compute(filter_key, lambda: compute_aggregates(filtered_df))
 
 # ================================
 # Key Metrics
 # ================================
-total_sales = filtered_df['Total Sales'].sum()
-total_profit = filtered_df['Total Profit'].sum()
-overall_gp = (total_profit / total_sales) if total_sales != 0 else 0
+total_sales = aggregates['total_sales']
+total_profit = aggregates['total_profit']
+overall_gp = aggregates['overall_gp']
 
 if not (item_search or barcode_search):
     st.markdown("### 🔑 Key Metrics")
@@ -134,61 +211,128 @@ col3.metric("Overall GP", f"{overall_gp:.2%}")
 # Monthly Performance Graph
 # ================================
 if not (item_search or barcode_search):
-    st.markdown("### 📅 Month-wise Performance")
-    months = ['Jul-2025','Aug-2025','Sep-2025']
-    month_data = []
-
-    for month in months:
-        sales_col = f'{month} Total Sales'
-        profit_col = f'{month} Total Profit'
-        month_sales = filtered_df[sales_col].sum() if sales_col in filtered_df.columns else 0
-        month_profit = filtered_df[profit_col].sum() if profit_col in filtered_df.columns else 0
-        
-        month_data.append({'Month': month, 'Type': 'Sales', 'Value': month_sales})
-        month_data.append({'Month': month, 'Type': 'Profit', 'Value': month_profit})
-
-    monthly_df = pd.DataFrame(month_data)
-    fig_monthly = px.bar(
-        monthly_df, x='Month', y='Value', color='Type', barmode='group',
-        text='Value', title="Monthly Sales & Profit"
-    )
-    st.plotly_chart(fig_monthly, use_container_width=True)
+    cube = slice_cube(sales["cube"], selected_category)
+    chart_section("📅 Month-wise Performance", "monthly", lambda: monthly_figures(cube, view["months"]), aggregate_cache(), filter_key)
 
 # ================================
 # Category-wise Analysis
 # ================================
 if not (item_search or barcode_search):
-    category_summary = filtered_df.groupby('Category').agg({'Total Sales':'sum','Total Profit':'sum'}).reset_index()
-    category_summary['GP'] = category_summary['Total Profit'] / category_summary['Total Sales'].replace(0,1)
-
-    fig_sales = px.bar(category_summary, x='Category', y='Total Sales', color='Total Sales', text='Total Sales', title="Total Sales by Category")
-    st.plotly_chart(fig_sales, use_container_width=True)
-
-    fig_profit = px.bar(category_summary, x='Category', y='Total Profit', color='Total Profit', text='Total Profit', title="Total Profit by Category")
-    st.plotly_chart(fig_profit, use_container_width=True)
-
-    fig_gp = px.bar(category_summary, x='Category', y='GP', color='GP', text=category_summary['GP'].apply(lambda x:f"{x:.2%}"), title="Gross Profit % by Category")
-    st.plotly_chart(fig_gp, use_container_width=True)
+    chart_section("📊 Category-wise Analysis", "category", lambda: category_figures(cube), aggregate_cache(), filter_key)
 
 # ================================
 # Item-wise Table
 # ================================
 st.markdown("### 📝 Item-wise Details")
 
-# Columns to display
+# Columns to display (per-month columns are added for the displayed rows only)
 table_cols = ['Item Bar Code','Item Name','Cost','Selling','Stock',
-              'Total Sales','Total Profit','Overall GP',
-              'Jul-2025 Total Sales','Jul-2025 Total Profit',
-              'Aug-2025 Total Sales','Aug-2025 Total Profit',
-              'Sep-2025 Total Sales','Sep-2025 Total Profit']
+              'Total Sales','Total Profit','Overall GP']
 
 # Ensure all columns exist
-for col in table_cols:
-    if col not in filtered_df.columns:
-        filtered_df[col] = 0
+table_df = filtered_df.reindex(columns=table_cols, fill_value=0)
 
-# Format GP
-filtered_df['Overall GP'] = filtered_df['Overall GP'].apply(lambda x: f"{x:.2%}")
+def render_item_page(page_df):
+    # filtered_df keeps the month view's row positions as its index
+    page_df = pd.concat([page_df, month_table(view, page_df.index.to_numpy()).set_index(page_df.index)], axis=1)
+    # Format GP
+    page_df['Overall GP'] = page_df['Overall GP'].apply(lambda x: f"{x:.2%}")
+    return page_df
 
-# Display sorted table
-st.dataframe(filtered_df[table_cols].sort_values('Total Sales', ascending=False))
+# Display sorted table, one page at a time
+with stage("table"):
+    paginated_table(table_df, key="items", default_sort='Total Sales', ascending=False, render_page=render_item_page)
+
+def export_items():
+    # Same columns as the table, with every month's figures; built on click
+    return pd.concat([table_df, month_table(view, table_df.index.to_numpy()).set_index(table_df.index)], axis=1)
+
+export_tables = {"Item-wise Details": export_items}
+if not searching:
+    export_tables["Category Summary"] = lambda: cube_category_summary(cube)
+
+# ================================
+# Inventory
+# ================================
+st.markdown("### 📦 Inventory")
+inventory = joined["inventory"]
+with stage("aggregate"):
+    if searching:
+        stock_items = inventory["items"].iloc[price_rows]
+        by_category = category_inventory(stock_items)
+    elif selected_category != "All":
+        stock_items = inventory["items"][inventory["items"]['Category'].to_numpy() == selected_category]
+        by_category = inventory["by_category"][inventory["by_category"]['Category'] == selected_category]
+    else:
+        # Rolled up once per loaded pair of files
+        stock_items = inventory["items"]
+        by_category = inventory["by_category"]
+    dead_items = dead_stock(stock_items)
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Stock Value (at cost)", f"{by_category['Stock Value'].sum():,.0f}")
+col2.metric("Dead Stock Items", f"{len(dead_items):,}")
+col3.metric("Dead Stock Value", f"{dead_items['Stock Value'].sum():,.0f}")
+
+def render_inventory_page(page_df):
+    page_df = page_df.copy()
+    for col in ['List Margin', 'Realized GP', 'Margin Gap']:
+        page_df[col] = page_df[col].apply(lambda x: f"{x:.2%}")
+    return page_df
+
+st.markdown("**By category** (days of cover from estimated daily units; ∞ = stock with no sales)")
+paginated_table(by_category, key="inventory_categories", render_page=render_inventory_page)
+
+st.markdown("**Dead stock** (stock on hand, no sales in any month)")
+with stage("table"):
+    paginated_table(dead_items.drop(columns='Dead Stock').reset_index(drop=True), key="dead_stock")
+
+export_tables["Inventory by Category"] = by_category
+export_tables["Dead Stock"] = lambda: dead_items.drop(columns='Dead Stock')
+export_panel(export_tables, key="export_variance")
+
+# ================================
+# Barcode Match Report
+# ================================
+with st.expander("🔗 Barcode Match Report"):
+    unmatched_price = price_sales_join["unmatched_price"]
+    unmatched_sales = price_sales_join["unmatched_sales"]
+    col1, col2 = st.columns(2)
+    col1.metric("Price list items with no sales", f"{len(unmatched_price):,}")
+    col2.metric("Sold items missing from price list", f"{len(unmatched_sales):,}")
+    col1.dataframe(unmatched_price[['Item Bar Code','Item Name']])
+    col2.dataframe(unmatched_sales[['Item Code','Items','Category']])
+
+# ================================
+# Period Variance (Oct vs Jul-Sep)
+# ================================
+st.markdown(f"### 🔀 {CURRENT_PERIOD} vs {BASE_PERIOD} Variance")
+variance_branch = st.selectbox("Variance Branch", comparable_branches() + [ALL_BRANCHES])
+with stage("variance"):
+    try:
+        if variance_branch == ALL_BRANCHES:
+            variance_df = all_branches_variance()
+        else:
+            variance_df = branch_variance(variance_branch).assign(Branch=variance_branch)
+    except Exception as e:
+        st.error(f"Error loading period files: {e}")
+        variance_df = pd.DataFrame()
+
+if not variance_df.empty:
+    variance = variance_totals(variance_df, *comparison_months())
+    col1, col2, col3 = st.columns(3)
+    col1.metric(f"Monthly Sales ({BASE_PERIOD})", f"{variance['base_run_rate']:,.0f}")
+    col2.metric(f"Monthly Sales ({CURRENT_PERIOD})", f"{variance['current_run_rate']:,.0f}", f"{variance['run_rate_change']:.2%}")
+    col3.metric("Overall GP", f"{variance['current_gp']:.2%}", f"{(variance['current_gp'] - variance['base_gp']) * 100:.2f} pts")
+
+    st.markdown(f"**Top {TOP_MOVERS} movers per category** (by change in monthly sales)")
+    movers = top_movers(variance_df)
+    mover_cols = ['Branch','Category','Item Code','Items','Status','Base Run Rate','Current Run Rate',
+                  'Run Rate Delta','Run Rate Change %','Base GP%','Current GP%','GP% Delta']
+    paginated_table(movers[mover_cols], key="movers")
+
+memory_panel({
+    "Sales": (lambda: load_sales(sales_file, branch, period_months), sales_df),
+    "Price list": (lambda: read_excel_cached(price_file), price_df),
+})
+timing_panel()